@@ -1,10 +1,15 @@
 from fastapi import Depends, HTTPException, status, Request
 from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy.ext.asyncio import AsyncSession
-from app.auth.jwt import decode_access_token
+from app.auth.jwt import decode_access_claims
+from app.auth.principal import principal_cache
+from app.auth.revocation import token_revocations
+from app.config.setting import settings
 from app.db.database import get_session
 from app.models.users_model import User 
+from app.schemas.user_schema import UserPrincipal
 from app.services.users_service import user_service
+from app.utils import dto
 import logging
 from typing import Optional
 
@@ -13,12 +18,45 @@ logger = logging.getLogger(__name__)
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login")
 
 
+async def _verify_token(token: str) -> dict:
+    """Decode the access token and reject it if revoked"""
+    claims = decode_access_claims(token)
+    try:
+        revoked = await token_revocations.is_revoked(claims)
+    except Exception as e:
+        # The DB lookups below still reject deactivated users
+        logger.warning(f"Token revocation check failed: {e}")
+        claims['_revocation_unchecked'] = True
+        return claims
+
+    if revoked:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Token has been revoked",
+        )
+    return claims
+
+
+def _principal_from_claims(claims: dict) -> Optional[UserPrincipal]:
+    """Principal carried by the token itself; None for tokens issued without the claims"""
+    if 'role' not in claims or 'is_admin' not in claims:
+        return None
+    return UserPrincipal(
+        id=int(claims['sub']),
+        role=claims['role'],
+        is_active=claims.get('is_active', True),
+        is_admin=claims['is_admin'],
+        email_verified=claims.get('email_verified', False),
+        company_id=claims.get('company_id'),
+    )
+
+
 async def get_current_user(
     token: str = Depends(oauth2_scheme),
     db: AsyncSession = Depends(get_session),
 ) -> User:
     try:
-        user_id = decode_access_token(token)
+        user_id = int((await _verify_token(token))['sub'])
         if not user_id:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
@@ -50,6 +88,75 @@ async def get_current_user(
         )
 
 
+async def get_current_principal(
+    token: str = Depends(oauth2_scheme),
+    db: AsyncSession = Depends(get_session),
+) -> UserPrincipal:
+    """Authorization fields of the current user, from the principal cache and the DB on a miss.
+
+    Entries are invalidated on account changes and live PRINCIPAL_CACHE_TTL
+    at most, so this is what role guards and write endpoints depend on.
+    """
+    return await _resolve_principal(token, db, trust_claims=False)
+
+
+async def get_claims_principal(
+    token: str = Depends(oauth2_scheme),
+    db: AsyncSession = Depends(get_session),
+) -> UserPrincipal:
+    """Principal for read-only endpoints.
+
+    With AUTH_CLAIMS_PRINCIPAL the signed token claims are trusted as-is
+    (only the Redis revocation list is consulted). Role and company claims
+    stay valid until the token expires, so never use this for role-gated
+    writes; those go through get_current_principal.
+    """
+    return await _resolve_principal(token, db, trust_claims=settings.AUTH_CLAIMS_PRINCIPAL)
+
+
+async def _resolve_principal(token: str, db: AsyncSession, trust_claims: bool) -> UserPrincipal:
+    try:
+        claims = await _verify_token(token)
+        user_id = int(claims['sub'])
+        if not user_id:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Invalid token",
+            )
+
+        principal = None
+        if trust_claims and token_revocations.enabled and not claims.get('_revocation_unchecked'):
+            principal = _principal_from_claims(claims)
+        if principal is None:
+            principal = await principal_cache.get(user_id)
+        if principal is None:
+            user = await user_service.get_user_by_id(db, user_id)
+            if not user:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail="User not found",
+                )
+            principal = dto.map_user_to_principal(user)
+            await principal_cache.set(principal)
+
+        if not principal.is_active:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Account is deactivated",
+            )
+
+        return principal
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error resolving principal: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid or expired token",
+        )
+
+
 async def get_current_active_user(
     current_user: User = Depends(get_current_user),
 ) -> User:
@@ -74,8 +181,8 @@ async def get_current_verified_user(
 
 
 async def admin_required(
-    current_user: User = Depends(get_current_active_user),
-) -> User:
+    current_user: UserPrincipal = Depends(get_current_principal),
+) -> UserPrincipal:
     if not current_user.is_admin:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
@@ -85,8 +192,8 @@ async def admin_required(
 
 
 async def candidate_required(
-    current_user: User = Depends(get_current_active_user),
-) -> User:
+    current_user: UserPrincipal = Depends(get_current_principal),
+) -> UserPrincipal:
     if current_user.role != "candidate":
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
@@ -96,8 +203,8 @@ async def candidate_required(
 
 
 async def employer_required(
-    current_user: User = Depends(get_current_active_user),
-) -> User:
+    current_user: UserPrincipal = Depends(get_current_principal),
+) -> UserPrincipal:
     if current_user.role != "employer":
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
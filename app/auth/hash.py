@@ -1,9 +1,84 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Tuple
+
 from passlib.context import CryptContext
 
-pwd_context = CryptContext(schemes=["pbkdf2_sha256"], deprecated="auto")
+from app.config.metrics import Gauge, Histogram
+from app.config.setting import settings
+
+# Hashes with other rounds than PASSWORD_HASH_ROUNDS are flagged for rehash on next login
+pwd_context = CryptContext(
+    schemes=["pbkdf2_sha256"],
+    deprecated="auto",
+    pbkdf2_sha256__default_rounds=settings.PASSWORD_HASH_ROUNDS,
+    pbkdf2_sha256__min_rounds=settings.PASSWORD_HASH_ROUNDS,
+    pbkdf2_sha256__max_rounds=settings.PASSWORD_HASH_ROUNDS,
+)
 
 def hash_password(password: str) -> str:
     return pwd_context.hash(password)
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return pwd_context.verify(plain_password, hashed_password)
\ No newline at end of file
+    return pwd_context.verify(plain_password, hashed_password)
+
+
+password_hash_duration = Histogram(
+    'password_hash_duration_seconds', 'Password hash/verify CPU time on the worker pool', ['operation']
+)
+password_hash_wait = Histogram(
+    'password_hash_wait_seconds', 'Time password operations waited for a free worker'
+)
+
+
+class PasswordHasher:
+    """Runs passlib off the event loop on a bounded thread pool.
+
+    PBKDF2 in hashlib releases the GIL, so workers hash in parallel while
+    the loop keeps serving requests. At most `workers` operations run at
+    once; the rest wait on a semaphore and are counted in `queued`.
+    """
+
+    def __init__(self, workers: int = 4):
+        self.workers = workers
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='password-hash')
+        self._slots: Optional[asyncio.Semaphore] = None
+        self.queued = 0
+        self.running = 0
+
+    async def _run(self, operation: str, func, *args):
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.workers)
+
+        self.queued += 1
+        wait_start = time.perf_counter()
+        try:
+            await self._slots.acquire()
+        finally:
+            self.queued -= 1
+        password_hash_wait.observe(time.perf_counter() - wait_start)
+
+        self.running += 1
+        try:
+            with password_hash_duration.time(operation):
+                return await asyncio.get_running_loop().run_in_executor(self._executor, func, *args)
+        finally:
+            self.running -= 1
+            self._slots.release()
+
+    async def hash(self, password: str) -> str:
+        return await self._run('hash', pwd_context.hash, password)
+
+    async def verify_and_update(self, password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+        """Returns (valid, new_hash); new_hash is set when the stored hash uses outdated parameters"""
+        return await self._run('verify', pwd_context.verify_and_update, password, hashed_password)
+
+    def close(self):
+        self._executor.shutdown(wait=False)
+
+
+password_hasher = PasswordHasher(settings.PASSWORD_HASH_WORKERS)
+
+Gauge('password_hash_queued', 'Password operations waiting for a worker', function=lambda: password_hasher.queued)
+Gauge('password_hash_running', 'Password operations running on the pool', function=lambda: password_hasher.running)
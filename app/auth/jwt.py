@@ -1,36 +1,51 @@
 from fastapi import HTTPException
 from datetime import datetime, timedelta
-from jose import jwt, JWTError
+import time
+import uuid
+from app.auth.verifier import token_verifier, TokenError
 from app.config.setting import settings as setting
 
 def create_access_token(data: dict) -> str:
     to_encode = data.copy()
     expire = datetime.utcnow() + timedelta(minutes=setting.ACCESS_TOKEN_EXPIRE_MINUTES)
-    to_encode.update({"exp": expire, "sub": str(data.get("sub"))})
-    return jwt.encode(to_encode, setting.JWT_SECRET_KEY, algorithm=setting.JWT_ALGORITHM)
+    # jti/iat_ms let a single token or all earlier tokens of a user be revoked
+    now = time.time()
+    to_encode.update({
+        "exp": expire, "iat": int(now), "iat_ms": int(now * 1000), "jti": uuid.uuid4().hex, "sub": str(data.get("sub"))
+    })
+    return token_verifier.encode(to_encode)
 
-def decode_access_token(token: str) -> int:
+def decode_access_claims(token: str) -> dict:
     try:
-        payload = jwt.decode(token, setting.JWT_SECRET_KEY, algorithms=[setting.JWT_ALGORITHM])
-        user_id = payload.get("sub")
-        if user_id is None:
+        payload = token_verifier.decode(token)
+        if payload.get("sub") is None:
             raise ValueError("Token payload missing user_id")
-        return int(user_id)
-    except JWTError:
+        if payload.get("type") == "refresh":
+            raise TokenError("Refresh token used as access token")
+        return payload
+    except TokenError:
         raise HTTPException(status_code=401, detail="Invalid or expired access token")
 
+def decode_access_token(token: str) -> int:
+    return int(decode_access_claims(token)["sub"])
+
 def create_refresh_token(data: dict) -> str:
     to_encode = data.copy()
-    expire = datetime.utcnow() + timedelta(days=7)
-    to_encode.update({"exp": expire, "sub": str(data.get("sub"))})
-    return jwt.encode(to_encode, setting.JWT_SECRET_KEY, algorithm=setting.JWT_ALGORITHM)
+    expire = datetime.utcnow() + timedelta(days=setting.REFRESH_TOKEN_EXPIRE_DAYS)
+    # fam/jti identify the token family and its current member in the refresh token store
+    to_encode.update({"exp": expire, "type": "refresh", "sub": str(data.get("sub"))})
+    return token_verifier.encode(to_encode)
 
-def decode_refresh_token(token: str) -> int:
+def decode_refresh_claims(token: str) -> dict:
     try:
-        payload = jwt.decode(token, setting.JWT_SECRET_KEY, algorithms=[setting.JWT_ALGORITHM])
-        user_id = payload.get("sub")
-        if user_id is None:
+        payload = token_verifier.decode(token)
+        if payload.get("sub") is None:
             raise ValueError("Token payload missing user_id")
-        return int(user_id)
-    except JWTError:
+        if payload.get("type") != "refresh":
+            raise TokenError("Not a refresh token")
+        return payload
+    except TokenError:
         raise HTTPException(status_code=401, detail="Invalid or expired refresh token")
+
+def decode_refresh_token(token: str) -> int:
+    return int(decode_refresh_claims(token)["sub"])
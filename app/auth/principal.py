@@ -0,0 +1,50 @@
+import logging
+from typing import Optional
+
+from app.config.cache import CacheManager
+from app.config.setting import settings
+from app.schemas.user_schema import UserPrincipal
+
+
+logger = logging.getLogger(__name__)
+
+
+class PrincipalCache:
+    """Short-lived cache of the authorization fields of a user.
+
+    Stored through CacheManager, so entries live in Redis and in each
+    worker's L1 tier; invalidate() deletes the Redis key and broadcasts
+    the eviction to every worker. Without Redis nothing is cached, since
+    an invalidation could not reach the other workers.
+    """
+
+    def __init__(self, ttl: int = 60):
+        self.ttl = ttl
+        self.cache: Optional[CacheManager] = None
+
+    def attach(self, cache_manager: Optional[CacheManager]):
+        self.cache = cache_manager
+
+    @staticmethod
+    def _key(user_id: int) -> str:
+        return f'principal:{user_id}'
+
+    async def get(self, user_id: int) -> Optional[UserPrincipal]:
+        if not self.cache:
+            return None
+        data = await self.cache.get(self._key(user_id))
+        if data is None:
+            return None
+        return UserPrincipal.model_validate(data)
+
+    async def set(self, principal: UserPrincipal):
+        if self.cache:
+            await self.cache.set(self._key(principal.id), principal.model_dump(mode='json'), expire=self.ttl)
+
+    async def invalidate(self, user_id: int):
+        """Call after changing role, activity, admin, verification, lock or company of a user"""
+        if self.cache:
+            await self.cache.delete(self._key(user_id))
+
+
+principal_cache = PrincipalCache(settings.PRINCIPAL_CACHE_TTL)
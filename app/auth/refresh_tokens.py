@@ -0,0 +1,142 @@
+import logging
+import time
+import uuid
+from typing import Any, Dict, Optional, Tuple
+
+from redis.asyncio import Redis
+
+from app.config.setting import settings
+from app.config.user_exceptions import InvalidTokenError
+
+
+logger = logging.getLogger(__name__)
+
+# Family check, revoke-all check, reuse detection and rotation in one call.
+# KEYS: family hash, user revoke-all marker. ARGV: presented jti, next jti, ttl ms.
+# Returns 1 rotated, 0 unknown/expired/revoked family, -1 reuse (family revoked).
+_ROTATE = """
+local family = redis.call('HMGET', KEYS[1], 'jti', 'issued')
+if not family[1] then
+    return 0
+end
+local revoked_before = tonumber(redis.call('GET', KEYS[2]))
+if revoked_before and tonumber(family[2]) < revoked_before then
+    redis.call('DEL', KEYS[1])
+    return 0
+end
+if family[1] ~= ARGV[1] then
+    redis.call('DEL', KEYS[1])
+    return -1
+end
+redis.call('HSET', KEYS[1], 'jti', ARGV[2])
+redis.call('PEXPIRE', KEYS[1], ARGV[3])
+return 1
+"""
+
+# KEYS: user revoke-all marker, kept family hash. ARGV: now ms, marker ttl s.
+# The kept family is re-stamped at the marker so it survives the revoke.
+# Families started in the same millisecond as the marker are kept too.
+_REVOKE_USER = """
+redis.call('SET', KEYS[1], ARGV[1], 'EX', ARGV[2])
+if KEYS[2] and redis.call('EXISTS', KEYS[2]) == 1 then
+    redis.call('HSET', KEYS[2], 'issued', ARGV[1])
+end
+return 1
+"""
+
+
+class RefreshTokenStore:
+    """Refresh token families in Redis.
+
+    Every login starts a family holding the jti of its only valid refresh
+    token. Using that token rotates the family to a new jti; presenting an
+    already rotated token means it leaked, so the whole family is revoked.
+    revoke_user() invalidates every family of a user started up to now,
+    optionally except the caller's own family.
+    Without Redis refresh tokens are only checked for signature and expiry.
+    """
+
+    def __init__(self, lifetime: int):
+        self.lifetime = lifetime
+        self.redis: Optional[Redis] = None
+        self._rotate = None
+        self._revoke_user = None
+
+    def attach(self, redis_client: Optional[Redis]):
+        self.redis = redis_client
+        self._rotate = redis_client.register_script(_ROTATE) if redis_client is not None else None
+        self._revoke_user = redis_client.register_script(_REVOKE_USER) if redis_client is not None else None
+
+    @property
+    def enabled(self) -> bool:
+        return self.redis is not None
+
+    @staticmethod
+    def _family_key(family: str) -> str:
+        return f'refresh_family:{family}'
+
+    @staticmethod
+    def _user_key(user_id) -> str:
+        return f'refresh_revoked_user:{user_id}'
+
+    async def issue(self, user_id: int) -> Tuple[str, str]:
+        """Start a token family; returns (family, jti) for the first refresh token"""
+        family, jti = uuid.uuid4().hex, uuid.uuid4().hex
+        if not self.redis:
+            return family, jti
+        try:
+            async with self.redis.pipeline(transaction=False) as pipe:
+                pipe.hset(self._family_key(family), mapping={'jti': jti, 'issued': int(time.time() * 1000)})
+                pipe.expire(self._family_key(family), self.lifetime)
+                await pipe.execute()
+        except Exception as e:
+            # The session still works until the access token expires
+            logger.error(f'Failed to store refresh token family of user {user_id}: {e}')
+        return family, jti
+
+    async def rotate(self, claims: Dict[str, Any]) -> str:
+        """Consume the refresh token and return the jti of its successor.
+
+        Raises InvalidTokenError for unknown, revoked or reused tokens;
+        Redis errors propagate so the caller can fail closed.
+        """
+        family, jti = claims.get('fam'), claims.get('jti')
+        if not family or not jti:
+            raise InvalidTokenError('Invalid refresh token')
+        next_jti = uuid.uuid4().hex
+        if self._rotate is None:
+            return next_jti
+
+        result = await self._rotate(
+            keys=[self._family_key(family), self._user_key(claims['sub'])],
+            args=[jti, next_jti, self.lifetime * 1000]
+        )
+        if result == -1:
+            logger.warning(f'Refresh token reuse detected for user {claims["sub"]}, family {family} revoked')
+            raise InvalidTokenError('Refresh token has already been used')
+        if result != 1:
+            raise InvalidTokenError('Refresh token has been revoked')
+        return next_jti
+
+    async def revoke_family(self, family: str):
+        if not self.redis:
+            return
+        try:
+            await self.redis.delete(self._family_key(family))
+        except Exception as e:
+            logger.error(f'Failed to revoke refresh token family {family}: {e}')
+
+    async def revoke_user(self, user_id: int, keep_family: Optional[str] = None):
+        """Revoke every refresh token family of user_id started before now, except keep_family"""
+        if not self.redis:
+            return
+        keys = [self._user_key(user_id)]
+        if keep_family:
+            keys.append(self._family_key(keep_family))
+        try:
+            await self._revoke_user(keys=keys, args=[int(time.time() * 1000), self.lifetime])
+        except Exception as e:
+            logger.error(f'Failed to revoke refresh tokens of user {user_id}: {e}')
+
+
+refresh_tokens = RefreshTokenStore(settings.REFRESH_TOKEN_EXPIRE_DAYS * 86400)
@@ -0,0 +1,89 @@
+import logging
+import time
+from typing import Any, Dict, Optional
+
+from redis.asyncio import Redis
+
+from app.config.setting import settings
+
+
+logger = logging.getLogger(__name__)
+
+# revoked_user markers below this are epoch seconds (year 5138 in seconds, 1973 in ms)
+_SECONDS_MARKER_LIMIT = 10 ** 11
+
+
+class TokenRevocationList:
+    """Revoked access tokens in Redis.
+
+    Single tokens are revoked by jti until they expire; revoke_user()
+    invalidates every token of a user issued before now (millisecond
+    resolution, so a login right after a reset survives), optionally except
+    the tokens of one refresh family (the caller's session). A check is one
+    MGET over both keys. Without Redis revocation is unavailable and
+    claims-only principals are not trusted.
+    """
+
+    def __init__(self, max_token_lifetime: int):
+        self.max_token_lifetime = max_token_lifetime
+        self.redis: Optional[Redis] = None
+
+    def attach(self, redis_client: Optional[Redis]):
+        self.redis = redis_client
+
+    @property
+    def enabled(self) -> bool:
+        return self.redis is not None
+
+    async def revoke_token(self, claims: Dict[str, Any]):
+        jti = claims.get('jti')
+        if not self.redis or not jti:
+            return
+        ttl = int(claims.get('exp', time.time() + self.max_token_lifetime) - time.time())
+        if ttl <= 0:
+            return
+        try:
+            await self.redis.set(f'revoked_jti:{jti}', 1, ex=ttl)
+        except Exception as e:
+            logger.error(f'Failed to revoke token {jti}: {e}')
+
+    async def revoke_user(self, user_id: int, keep_family: Optional[str] = None):
+        """Reject every access token of user_id issued before this millisecond, except those of keep_family"""
+        if not self.redis:
+            return
+        now_ms = int(time.time() * 1000)
+        marker = f'{now_ms}:{keep_family}' if keep_family else now_ms
+        try:
+            await self.redis.set(f'revoked_user:{user_id}', marker, ex=self.max_token_lifetime)
+        except Exception as e:
+            logger.error(f'Failed to revoke tokens of user {user_id}: {e}')
+
+    async def is_revoked(self, claims: Dict[str, Any]) -> bool:
+        if not self.redis:
+            return False
+        jti = claims.get('jti') or ''
+        revoked_jti, revoked_before = await self.redis.mget(f'revoked_jti:{jti}', f'revoked_user:{claims["sub"]}')
+        if revoked_jti is not None:
+            return True
+        if revoked_before is None:
+            return False
+        if isinstance(revoked_before, bytes):
+            revoked_before = revoked_before.decode()
+        revoked_at, _, kept_family = str(revoked_before).partition(':')
+        if kept_family and claims.get('fam') == kept_family:
+            return False
+        revoked_at = int(revoked_at)
+        if revoked_at < _SECONDS_MARKER_LIMIT:
+            # Marker written in whole seconds before the switch to milliseconds
+            revoked_at = (revoked_at + 1) * 1000
+        return _issued_ms(claims) < revoked_at
+
+
+def _issued_ms(claims: Dict[str, Any]) -> int:
+    """Issue time in ms; tokens minted before iat_ms count from the start of their iat second"""
+    if 'iat_ms' in claims:
+        return int(claims['iat_ms'])
+    return int(claims.get('iat', 0)) * 1000
+
+
+token_revocations = TokenRevocationList(settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60)
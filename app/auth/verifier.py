@@ -0,0 +1,130 @@
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+from jose import jwk, jwt as jose_jwt, JWTError
+
+from app.config.setting import settings
+
+try:
+    import jwt as pyjwt
+    from jwt.algorithms import get_default_algorithms
+except ImportError:
+    pyjwt = None
+
+
+class TokenError(Exception):
+    """Token signature, format or expiry check failed"""
+
+
+_LIBRARY_ERRORS = (JWTError, pyjwt.PyJWTError) if pyjwt is not None else (JWTError,)
+
+
+def load_key(value: Optional[str]) -> Optional[str]:
+    """PEM key given inline or as a path to a PEM file"""
+    if not value:
+        return None
+    if value.lstrip().startswith('-----BEGIN'):
+        return value
+    return Path(value).read_text()
+
+
+class TokenVerifier:
+    """Signs and verifies JWTs with keys parsed once.
+
+    HS* algorithms use the shared secret. RS*/ES*/EdDSA sign with the private
+    key and verify with the public one, so a service holding only the public
+    key can verify tokens but not issue them. Asymmetric algorithms use PyJWT
+    whenever it supports them (EdDSA and RS*/ES* need `cryptography`); HS* and
+    the rest use python-jose, which verifies HMAC faster on a pre-built key
+    (see benchmarks/bench_token_verifier.py).
+
+    Successful verifications are memoized per token string in a bounded LRU
+    until min(exp, now + memo_ttl); failures are never memoized. Callers get
+    a copy of the claims and may modify it.
+    """
+
+    def __init__(self, algorithm: str, secret: Optional[str] = None, private_key: Optional[str] = None,
+                 public_key: Optional[str] = None, memo_size: int = 4096, memo_ttl: float = 60.0):
+        self.algorithm = algorithm
+        self.memo_size = memo_size
+        self.memo_ttl = memo_ttl
+        self._memo: OrderedDict[str, Tuple[float, Dict[str, Any]]] = OrderedDict()
+        self.stats = {'hits': 0, 'misses': 0}
+
+        if algorithm.startswith('HS'):
+            if not secret:
+                raise ValueError(f'{algorithm} requires JWT_SECRET_KEY')
+            signing_key = verifying_key = secret
+        else:
+            if not private_key and not public_key:
+                raise ValueError(f'{algorithm} requires JWT_PUBLIC_KEY or JWT_PRIVATE_KEY')
+            signing_key, verifying_key = private_key, public_key
+
+        use_pyjwt = pyjwt is not None and not algorithm.startswith('HS') and algorithm in get_default_algorithms()
+        self.backend = 'pyjwt' if use_pyjwt else 'jose'
+        self._signing_key = self._prepare_key(signing_key) if signing_key else None
+        if verifying_key:
+            self._verifying_key = self._prepare_key(verifying_key)
+        else:
+            self._verifying_key = self._signing_key.public_key()
+
+    def _prepare_key(self, key: str):
+        if self.backend == 'pyjwt':
+            return get_default_algorithms()[self.algorithm].prepare_key(key)
+        return jwk.construct(key, self.algorithm)
+
+    @property
+    def can_sign(self) -> bool:
+        return self._signing_key is not None
+
+    def encode(self, claims: Dict[str, Any]) -> str:
+        if self._signing_key is None:
+            raise RuntimeError(f'No private key configured to sign {self.algorithm} tokens')
+        if self.backend == 'pyjwt':
+            return pyjwt.encode(claims, self._signing_key, algorithm=self.algorithm)
+        return jose_jwt.encode(claims, self._signing_key, algorithm=self.algorithm)
+
+    def _decode(self, token: str) -> Dict[str, Any]:
+        try:
+            if self.backend == 'pyjwt':
+                return pyjwt.decode(token, self._verifying_key, algorithms=[self.algorithm])
+            return jose_jwt.decode(token, self._verifying_key, algorithms=[self.algorithm])
+        except _LIBRARY_ERRORS as e:
+            raise TokenError(str(e)) from e
+
+    def decode(self, token: str) -> Dict[str, Any]:
+        """Verified claims of token; raises TokenError"""
+        now = time.time()
+        entry = self._memo.get(token)
+        if entry is not None:
+            expires_at, claims = entry
+            if expires_at > now:
+                self._memo.move_to_end(token)
+                self.stats['hits'] += 1
+                return dict(claims)
+            del self._memo[token]
+
+        self.stats['misses'] += 1
+        claims = self._decode(token)
+        if self.memo_size > 0 and 'exp' in claims:
+            expires_at = min(float(claims['exp']), now + self.memo_ttl)
+            if expires_at > now:
+                self._memo[token] = (expires_at, claims)
+                if len(self._memo) > self.memo_size:
+                    self._memo.popitem(last=False)
+        return dict(claims)
+
+    def clear(self):
+        self._memo.clear()
+
+
+token_verifier = TokenVerifier(
+    settings.JWT_ALGORITHM,
+    secret=settings.JWT_SECRET_KEY,
+    private_key=load_key(settings.JWT_PRIVATE_KEY),
+    public_key=load_key(settings.JWT_PUBLIC_KEY),
+    memo_size=settings.JWT_VERIFY_CACHE_SIZE,
+    memo_ttl=settings.JWT_VERIFY_CACHE_TTL,
+)
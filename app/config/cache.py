@@ -1,30 +1,410 @@
+import asyncio
 import json
-from typing import Any, Optional
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
 from redis.asyncio import Redis
 import logging
 
+from app.config.cache_codec import CacheCodec
+from app.config.metrics import cache_requests, redis_command_duration
+
 logger = logging.getLogger(__name__)
 
+# Namespaced keys embed the namespace generation: "<namespace>:v<version>:<key>".
+# Bumping the generation orphans every key of the namespace in O(1); orphans
+# simply expire through their TTL.
+_NAMESPACED_GET = """
+local version = redis.call('GET', KEYS[1]) or '0'
+return redis.call('GET', ARGV[1] .. ':v' .. version .. ':' .. ARGV[2])
+"""
+
+_NAMESPACED_SET = """
+local version = redis.call('GET', KEYS[1]) or '0'
+return redis.call('SET', ARGV[1] .. ':v' .. version .. ':' .. ARGV[2], ARGV[3], 'EX', ARGV[4])
+"""
+
+# Conditional store for get_or_compute: only if no delete/invalidate touched the key since
+# the compute started. KEYS: key generation[, namespace version].
+# ARGV: expected generation, namespace, key, payload, ttl. Returns 1 stored, 0 skipped.
+_SET_IF_GENERATION = """
+local generation = redis.call('GET', KEYS[1]) or '0'
+local target = ARGV[3]
+if KEYS[2] then
+    local version = redis.call('GET', KEYS[2]) or '0'
+    generation = generation .. ':' .. version
+    target = ARGV[2] .. ':v' .. version .. ':' .. ARGV[3]
+end
+if generation ~= ARGV[1] then
+    return 0
+end
+redis.call('SET', target, ARGV[4], 'EX', ARGV[5])
+return 1
+"""
+
+# Per-key generations only need to outlive a compute
+GENERATION_TTL = 3600
+
+# Shared cache namespaces
+CATEGORIES_NAMESPACE = 'categories'
+JOB_SEARCH_NAMESPACE = 'job_search'
+
+INVALIDATION_CHANNEL = 'cache:invalidation'
+
+_RELEASE_LOCK = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+_MISSING = object()
+
+
+class LocalCache:
+    """Bounded in-process LRU with per-entry TTL (L1 tier of CacheManager)"""
+
+    def __init__(self, max_items: int, ttl: int):
+        self.max_items = max_items
+        self.ttl = ttl
+        self._data: OrderedDict[str, Tuple[float, Any]] = OrderedDict()
+        self.stats = {'hits': 0, 'misses': 0, 'evictions': 0}
+
+    def get(self, key: str) -> Any:
+        entry = self._data.get(key)
+        if entry is None:
+            self.stats['misses'] += 1
+            cache_requests.inc('local', 'miss')
+            return _MISSING
+
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._data[key]
+            self.stats['misses'] += 1
+            cache_requests.inc('local', 'miss')
+            return _MISSING
+
+        self._data.move_to_end(key)
+        self.stats['hits'] += 1
+        cache_requests.inc('local', 'hit')
+        return value
+
+    def set(self, key: str, value: Any, expire: int):
+        self._data[key] = (time.monotonic() + min(expire, self.ttl), value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.max_items:
+            self._data.popitem(last=False)
+            self.stats['evictions'] += 1
+
+    def delete(self, key: str):
+        self._data.pop(key, None)
+
+    def clear(self):
+        self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
 class CacheManager:  
-    def __init__(self, redis_client: Redis):
+    def __init__(self, redis_client: Redis, codec: Optional[CacheCodec] = None,
+                 local_max_items: int = 0, local_ttl: int = 30):
         self.redis = redis_client
+        self.codec = codec or CacheCodec()
+        self._namespaced_get = redis_client.register_script(_NAMESPACED_GET)
+        self._namespaced_set = redis_client.register_script(_NAMESPACED_SET)
+        self._release_lock_script = redis_client.register_script(_RELEASE_LOCK)
+        self._set_if_generation = redis_client.register_script(_SET_IF_GENERATION)
+        self._inflight: Dict[str, asyncio.Future] = {}
 
-    async def get(self, key: str) -> Optional[Any]:
+        # Optional L1 tier; values are shared between callers and must be treated as read-only
+        self.local = LocalCache(local_max_items, local_ttl) if local_max_items > 0 else None
+        self._local_generations: Dict[str, int] = {}
+        self._local_key_drops = 0
+        self._instance_id = uuid.uuid4().hex
+        self._listener: Optional[asyncio.Task] = None
+        self.stats = {'hits': 0, 'misses': 0, 'errors': 0}
+
+    @staticmethod
+    def _version_key(namespace: str) -> str:
+        return f'cache_ns:{namespace}'
+
+    @staticmethod
+    def _generation_keys(key: str, namespace: Optional[str]) -> list:
+        if not namespace:
+            return [f'cache_gen:{key}']
+        return [f'cache_gen:{namespace}:{key}', CacheManager._version_key(namespace)]
+
+    async def _generation(self, key: str, namespace: Optional[str]) -> Optional[str]:
+        """Invalidation generation of a key, as compared by _SET_IF_GENERATION; None if unknown"""
         try:
-            value = await self.redis.get(key)
-            return json.loads(value) if value else None
+            values = await self.redis.mget(self._generation_keys(key, namespace))
         except Exception as e:
+            self.stats['errors'] += 1
+            logger.error(f'Cache generation error: {e}')
+            return None
+        return ':'.join(value.decode() if isinstance(value, bytes) else (value or '0') for value in values)
+
+    def _local_key(self, key: str, namespace: Optional[str]) -> str:
+        if not namespace:
+            return key
+        return f'{namespace}:g{self._local_generations.get(namespace, 0)}:{key}'
+
+    def _local_epoch(self, namespace: Optional[str]) -> Tuple[int, int]:
+        return self._local_generations.get(namespace, 0) if namespace else 0, self._local_key_drops
+
+    async def get(self, key: str, namespace: Optional[str] = None) -> Optional[Any]:
+        if self.local:
+            local_key = self._local_key(key, namespace)
+            epoch = self._local_epoch(namespace)
+            value = self.local.get(local_key)
+            if value is not _MISSING:
+                return value
+
+        try:
+            with redis_command_duration.time('get'):
+                if namespace:
+                    raw = await self._namespaced_get(keys=[self._version_key(namespace)], args=[namespace, key])
+                else:
+                    raw = await self.redis.get(key)
+        except Exception as e:
+            self.stats['errors'] += 1
             logger.error(f'Cache get error: {e}')
             return None
+
+        if not raw:
+            self.stats['misses'] += 1
+            cache_requests.inc('redis', 'miss')
+            return None
+
+        self.stats['hits'] += 1
+        cache_requests.inc('redis', 'hit')
+        try:
+            value = self.codec.decode(raw)
+        except Exception as e:
+            self.stats['errors'] += 1
+            logger.error(f'Cache decode error for {key}: {e}')
+            return None
+        # Skip the L1 fill if an invalidation landed while Redis was answering
+        if self.local and self._local_epoch(namespace) == epoch:
+            self.local.set(local_key, value, self.local.ttl)
+        return value
     
-    async def set(self, key: str, value: Any, expire: int = 3600):
+    async def set(self, key: str, value: Any, expire: int = 3600, namespace: Optional[str] = None,
+                  generation: Optional[str] = None) -> bool:
+        """Store value; with generation, only if the key was not invalidated since it was read"""
+        if self.local:
+            local_key = self._local_key(key, namespace)
+            epoch = self._local_epoch(namespace)
         try:
-            await self.redis.set(key, json.dumps(value), ex=expire)
+            payload = self.codec.encode(value)
+            with redis_command_duration.time('set'):
+                if generation is not None:
+                    stored = await self._set_if_generation(
+                        keys=self._generation_keys(key, namespace),
+                        args=[generation, namespace or '', key, payload, expire]
+                    )
+                    if not stored:
+                        return False
+                elif namespace:
+                    await self._namespaced_set(
+                        keys=[self._version_key(namespace)], args=[namespace, key, payload, expire]
+                    )
+                else:
+                    await self.redis.set(key, payload, ex=expire)
         except Exception as e:
+            self.stats['errors'] += 1
             logger.error(f'Cache set error: {e}')
+            return False
+
+        if self.local and self._local_epoch(namespace) == epoch:
+            self.local.set(local_key, value, expire)
+        return True
 
     async def delete(self, key: str):
+        """Delete one exact key (Redis DEL does not expand globs, use invalidate for groups)"""
+        self._drop_local(keys=[key])
+        try:
+            with redis_command_duration.time('delete'):
+                # Bumping the generation stops computes that read before the delete from storing
+                generation_key = self._generation_keys(key, None)[0]
+                async with self.redis.pipeline(transaction=True) as pipe:
+                    pipe.delete(key)
+                    pipe.incr(generation_key)
+                    pipe.expire(generation_key, GENERATION_TTL)
+                    await pipe.execute()
+            await self._publish_invalidation(keys=[key])
+        except Exception as e:
+            self.stats['errors'] += 1
+            logger.error(f'Cache delete error: {e}')
+
+    async def invalidate(self, *namespaces: str):
+        """Drop every key stored under the given namespaces by bumping their generation"""
+        self._drop_local(namespaces=namespaces)
+        try:
+            with redis_command_duration.time('invalidate'):
+                async with self.redis.pipeline(transaction=False) as pipe:
+                    for namespace in namespaces:
+                        pipe.incr(self._version_key(namespace))
+                    await pipe.execute()
+            await self._publish_invalidation(namespaces=list(namespaces))
+        except Exception as e:
+            self.stats['errors'] += 1
+            logger.error(f'Cache invalidate error: {e}')
+
+    async def get_or_compute(
+        self,
+        key: str,
+        compute: Callable[[], Awaitable[Any]],
+        ttl: int = 3600,
+        namespace: Optional[str] = None,
+        stale_ttl: int = 0,
+        use_lock: bool = False,
+        lock_timeout: float = 10.0
+    ) -> Any:
+        """Return the cached value or compute it once for all concurrent callers.
+
+        Values are stored as {'value', 'fresh_until'} envelopes kept stale_ttl
+        seconds past freshness. Concurrent misses on this worker await the same
+        task; with use_lock only the Redis lock holder recomputes fleet-wide.
+        Stale entries are served to everyone but the caller doing the recompute.
+        The compute task is detached from its caller, so a cancelled leader does
+        not fail the followers; compute must therefore not use resources owned
+        by the caller, such as its request's DB session. A result is not stored
+        if the key was deleted or its namespace invalidated while computing.
+        """
+        envelope = await self.get(key, namespace)
+        if envelope is not None and envelope['fresh_until'] > time.time():
+            return envelope['value']
+        stale = envelope['value'] if envelope is not None else _MISSING
+
+        flight_key = f'{namespace}|{key}'
+        flight = self._inflight.get(flight_key)
+        if flight is not None:
+            if stale is not _MISSING:
+                return stale
+            return await asyncio.shield(flight)
+
+        flight = asyncio.ensure_future(self._compute_as_leader(
+            key, compute, ttl, namespace, stale_ttl, stale, use_lock, lock_timeout
+        ))
+        self._inflight[flight_key] = flight
+        flight.add_done_callback(lambda done: self._finish_flight(flight_key, done))
+        return await asyncio.shield(flight)
+
+    def _finish_flight(self, flight_key: str, flight: asyncio.Future):
+        if self._inflight.get(flight_key) is flight:
+            del self._inflight[flight_key]
+        # Mark retrieved so a flight without followers does not log a warning
+        if not flight.cancelled():
+            flight.exception()
+
+    async def _compute_as_leader(self, key, compute, ttl, namespace, stale_ttl, stale, use_lock, lock_timeout):
+        lock_key = f'cache_lock:{namespace}:{key}' if namespace else f'cache_lock:{key}'
+        token = None
+        if use_lock:
+            acquired, token = await self._acquire_lock(lock_key, lock_timeout)
+            if not acquired:
+                if stale is not _MISSING:
+                    return stale
+                envelope = await self._wait_for_fresh(key, namespace, lock_timeout)
+                if envelope is not None:
+                    return envelope['value']
+                # Lock holder did not deliver in time, compute ourselves
+
+        try:
+            generation = await self._generation(key, namespace)
+            value = await compute()
+            if generation is not None:
+                envelope = {'value': value, 'fresh_until': time.time() + ttl}
+                await self.set(key, envelope, expire=ttl + stale_ttl, namespace=namespace, generation=generation)
+            return value
+        finally:
+            if token:
+                await self._release_lock(lock_key, token)
+
+    async def _acquire_lock(self, lock_key: str, timeout: float) -> Tuple[bool, Optional[str]]:
+        token = uuid.uuid4().hex
+        try:
+            with redis_command_duration.time('lock'):
+                acquired = await self.redis.set(lock_key, token, nx=True, px=int(timeout * 1000))
+        except Exception as e:
+            self.stats['errors'] += 1
+            logger.error(f'Cache lock error: {e}')
+            return True, None
+        return bool(acquired), token if acquired else None
+
+    async def _release_lock(self, lock_key: str, token: str):
         try:
-            await self.redis.delete(key)
+            with redis_command_duration.time('unlock'):
+                await self._release_lock_script(keys=[lock_key], args=[token])
         except Exception as e:
-            logger.error(f'Cache delete error: {e}')
\ No newline at end of file
+            self.stats['errors'] += 1
+            logger.error(f'Cache unlock error: {e}')
+
+    async def _wait_for_fresh(self, key: str, namespace: Optional[str], timeout: float) -> Optional[dict]:
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            await asyncio.sleep(0.05)
+            envelope = await self.get(key, namespace)
+            if envelope is not None and envelope['fresh_until'] > time.time():
+                return envelope
+        return None
+
+    def get_stats(self) -> Dict[str, Dict[str, int]]:
+        """Hit/miss counters per tier"""
+        stats = {'redis': dict(self.stats)}
+        if self.local:
+            stats['local'] = {**self.local.stats, 'size': len(self.local)}
+        return stats
+
+    # L1 invalidation broadcast
+    def _drop_local(self, keys=(), namespaces=()):
+        if not self.local:
+            return
+        for key in keys:
+            self.local.delete(key)
+            self._local_key_drops += 1
+        for namespace in namespaces:
+            self._local_generations[namespace] = self._local_generations.get(namespace, 0) + 1
+
+    async def _publish_invalidation(self, keys=None, namespaces=None):
+        if not self.local:
+            return
+        message = {'origin': self._instance_id, 'keys': keys or [], 'namespaces': namespaces or []}
+        with redis_command_duration.time('publish'):
+            await self.redis.publish(INVALIDATION_CHANNEL, json.dumps(message))
+
+    async def start_invalidation_listener(self):
+        """Subscribe to invalidations from other workers so their writes evict our L1 entries"""
+        if self.local and self._listener is None:
+            self._listener = asyncio.create_task(self._listen_invalidations())
+
+    async def stop_invalidation_listener(self):
+        if self._listener:
+            self._listener.cancel()
+            try:
+                await self._listener
+            except asyncio.CancelledError:
+                pass
+            self._listener = None
+
+    async def _listen_invalidations(self):
+        while True:
+            pubsub = self.redis.pubsub(ignore_subscribe_messages=True)
+            try:
+                await pubsub.subscribe(INVALIDATION_CHANNEL)
+                async for message in pubsub.listen():
+                    data = json.loads(message['data'])
+                    if data.get('origin') != self._instance_id:
+                        self._drop_local(keys=data.get('keys', []), namespaces=data.get('namespaces', []))
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f'Cache invalidation listener error: {e}')
+                # Messages may have been missed while disconnected
+                self.local.clear()
+                await asyncio.sleep(1)
+            finally:
+                await pubsub.close()
@@ -0,0 +1,143 @@
+import json
+import zlib
+from datetime import date, datetime
+from enum import Enum
+from typing import Any, Optional
+import logging
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+try:
+    import lz4.frame as lz4_frame
+except ImportError:
+    lz4_frame = None
+
+logger = logging.getLogger(__name__)
+
+# Every payload starts with one header byte: 0b0001_SSCC, SS = serializer,
+# CC = compression. 0x10-0x1F never starts a JSON document, so values
+# written before the header existed are still decoded as plain JSON.
+_HEADER_BASE = 0x10
+
+SERIALIZERS = {'json': 0, 'orjson': 1, 'msgpack': 2}
+COMPRESSIONS = {None: 0, 'zlib': 1, 'zstd': 2, 'lz4': 3}
+
+
+def _default(value: Any) -> Any:
+    """Fallback for types the serializers do not handle natively"""
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, (set, frozenset)):
+        return list(value)
+    raise TypeError(f'Object of type {type(value).__name__} is not cache serializable')
+
+
+class CacheCodec:
+    """Serializes cache values with a format header so codecs can change without flushing Redis"""
+
+    def __init__(self, serializer: str = 'orjson', compression: Optional[str] = None,
+                 compression_threshold: int = 1024):
+        if serializer not in SERIALIZERS:
+            raise ValueError(f'Unknown cache serializer: {serializer}')
+        if compression not in COMPRESSIONS:
+            raise ValueError(f'Unknown cache compression: {compression}')
+
+        if serializer == 'orjson' and orjson is None:
+            logger.warning('orjson is not installed, falling back to json cache serializer')
+            serializer = 'json'
+        if serializer == 'msgpack' and msgpack is None:
+            logger.warning('msgpack is not installed, falling back to json cache serializer')
+            serializer = 'json'
+        if (compression == 'zstd' and zstandard is None) or (compression == 'lz4' and lz4_frame is None):
+            logger.warning(f'{compression} is not installed, falling back to zlib cache compression')
+            compression = 'zlib'
+
+        self.serializer = serializer
+        self.compression = compression
+        self.compression_threshold = compression_threshold
+
+    def encode(self, value: Any) -> bytes:
+        data = self._serialize(value)
+        compression = None
+        if self.compression and len(data) >= self.compression_threshold:
+            data = self._compress(self.compression, data)
+            compression = self.compression
+
+        header = _HEADER_BASE | SERIALIZERS[self.serializer] << 2 | COMPRESSIONS[compression]
+        return bytes((header,)) + data
+
+    def decode(self, payload: bytes) -> Any:
+        if isinstance(payload, str):
+            payload = payload.encode()
+        if not payload or not _HEADER_BASE <= payload[0] < _HEADER_BASE + 0x10:
+            # Legacy header-less JSON
+            return json.loads(payload)
+
+        header = payload[0]
+        serializer = _lookup(SERIALIZERS, header >> 2 & 0b11)
+        compression = _lookup(COMPRESSIONS, header & 0b11)
+        data = payload[1:]
+        if compression:
+            data = self._decompress(compression, data)
+        return self._deserialize(serializer, data)
+
+    def _serialize(self, value: Any) -> bytes:
+        if self.serializer == 'orjson':
+            return orjson.dumps(value, default=_default)
+        if self.serializer == 'msgpack':
+            return msgpack.packb(value, default=_default, use_bin_type=True)
+        return json.dumps(value, default=_default, separators=(',', ':')).encode()
+
+    @staticmethod
+    def _deserialize(serializer: str, data: bytes) -> Any:
+        if serializer == 'orjson':
+            if orjson is None:
+                return json.loads(data)
+            return orjson.loads(data)
+        if serializer == 'msgpack':
+            if msgpack is None:
+                raise ValueError('msgpack cache payload but msgpack is not installed')
+            return msgpack.unpackb(data, raw=False)
+        return json.loads(data)
+
+    @staticmethod
+    def _compress(compression: str, data: bytes) -> bytes:
+        if compression == 'zstd':
+            return zstandard.ZstdCompressor(level=3).compress(data)
+        if compression == 'lz4':
+            return lz4_frame.compress(data)
+        return zlib.compress(data, 6)
+
+    @staticmethod
+    def _decompress(compression: str, data: bytes) -> bytes:
+        if compression == 'zstd':
+            if zstandard is None:
+                raise ValueError('zstd cache payload but zstandard is not installed')
+            return zstandard.ZstdDecompressor().decompress(data)
+        if compression == 'lz4':
+            if lz4_frame is None:
+                raise ValueError('lz4 cache payload but lz4 is not installed')
+            return lz4_frame.decompress(data)
+        return zlib.decompress(data)
+
+
+def _lookup(table: dict, code: int):
+    for name, value in table.items():
+        if value == code:
+            return name
+    raise ValueError(f'Unknown cache payload code: {code}')
@@ -3,8 +3,18 @@ from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from app.config.redis import redis_connection
 from app.config.cache import CacheManager
+from app.config.cache_codec import CacheCodec
 from app.config.logging import setup_logging
 from app.config.setting import settings
+from app.config.middleware import rate_limiter
+from app.db.database import replica_router
+from app.services.job_views_service import job_view_buffer
+from app.services.metrics_service import metrics_collector
+from app.utils.email import email_service
+from app.auth.hash import password_hasher
+from app.auth.principal import principal_cache
+from app.auth.revocation import token_revocations
+from app.auth.refresh_tokens import refresh_tokens
 
 logger = logging.getLogger(__name__)
 
@@ -18,12 +28,25 @@ async def lifespan(app: FastAPI):
     setup_logging(settings.LOG_LEVEL, settings.LOG_FILE)
     
     # Connect to Redis
+    redis_client = None
     try:
         redis_client = await redis_connection.connect()
+        cache_client = await redis_connection.connect_binary()
         
         # Initialize cache manager
-        cache_manager = CacheManager(redis_client)
+        cache_manager = CacheManager(
+            cache_client,
+            codec=CacheCodec(
+                serializer=settings.CACHE_SERIALIZER,
+                compression=settings.CACHE_COMPRESSION,
+                compression_threshold=settings.CACHE_COMPRESSION_THRESHOLD
+            ),
+            local_max_items=settings.CACHE_LOCAL_MAX_ITEMS,
+            local_ttl=settings.CACHE_LOCAL_TTL
+        )
+        await cache_manager.start_invalidation_listener()
         app.state.cache = cache_manager
+        principal_cache.attach(cache_manager)
         
         logger.info("Successfully connected to Redis and initialized cache")
         
@@ -31,11 +54,40 @@ async def lifespan(app: FastAPI):
         logger.error(f"Failed to connect to Redis: {e}")
         # Continue without Redis (graceful degradation)
         app.state.cache = None
+        redis_client = None
+
+    # Shared rate limit state, local token buckets when Redis is unavailable
+    await rate_limiter.start(redis_client)
+
+    # Read-your-writes markers shared across workers
+    replica_router.attach(redis_client)
+
+    # Access token revocation list
+    token_revocations.attach(redis_client)
+
+    # Refresh token families (rotation and reuse detection)
+    refresh_tokens.attach(redis_client)
+
+    # Buffered job views, kept in process memory when Redis is unavailable
+    await job_view_buffer.start(redis_client)
+
+    # Request metrics are written to PerformanceMetric in the background
+    if settings.METRICS_ENABLED:
+        await metrics_collector.start()
     
     yield
     
     # Shutdown
     logger.info("Shutting down application...")
+
+    await job_view_buffer.stop()
+    await rate_limiter.stop()
+    await metrics_collector.stop()
+    await email_service.close()
+    password_hasher.close()
+
+    if app.state.cache:
+        await app.state.cache.stop_invalidation_listener()
     
     # Disconnect from Redis
     await redis_connection.disconnect()
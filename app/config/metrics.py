@@ -0,0 +1,191 @@
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+# Prometheus text exposition format 0.0.4
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+FAST_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1.0)
+
+LabelValues = Tuple[str, ...]
+
+
+def _escape(value) -> str:
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_value(value: float) -> str:
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value))
+
+
+class MetricsRegistry:
+    """Collection of metrics rendered together for the /metrics endpoint"""
+
+    def __init__(self):
+        self._metrics: Dict[str, 'Metric'] = {}
+
+    def register(self, metric: 'Metric'):
+        if metric.name in self._metrics:
+            raise ValueError(f'Metric {metric.name} is already registered')
+        self._metrics[metric.name] = metric
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for metric in self._metrics.values():
+            lines.append(f'# HELP {metric.family} {metric.documentation}')
+            lines.append(f'# TYPE {metric.family} {metric.type}')
+            for name, labels, value in metric.samples():
+                if labels:
+                    label_str = ','.join(f'{key}="{_escape(val)}"' for key, val in labels)
+                    lines.append(f'{name}{{{label_str}}} {_format_value(value)}')
+                else:
+                    lines.append(f'{name} {_format_value(value)}')
+        return '\n'.join(lines) + '\n'
+
+
+REGISTRY = MetricsRegistry()
+
+
+class Metric:
+    type = 'untyped'
+
+    @property
+    def family(self) -> str:
+        """Name used on the HELP/TYPE lines; must match the sample names"""
+        return self.name
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 registry: Optional[MetricsRegistry] = REGISTRY):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        if registry is not None:
+            registry.register(self)
+
+    def _labels(self, values: LabelValues) -> Tuple[Tuple[str, str], ...]:
+        return tuple(zip(self.labelnames, values))
+
+    def samples(self) -> Iterator[Tuple[str, Tuple[Tuple[str, str], ...], float]]:
+        raise NotImplementedError
+
+
+class Counter(Metric):
+    type = 'counter'
+
+    @property
+    def family(self) -> str:
+        return f'{self.name}_total'
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, *labels: str, amount: float = 1.0):
+        self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def get(self, *labels: str) -> float:
+        return self._values.get(labels, 0.0)
+
+    def samples(self):
+        for labels, value in list(self._values.items()):
+            yield self.family, self._labels(labels), value
+
+
+class Gauge(Metric):
+    """Gauge set directly or read from `function` at scrape time.
+
+    A labelled function gauge returns {label values tuple: value}.
+    """
+    type = 'gauge'
+
+    def __init__(self, *args, function: Optional[Callable[[], Union[float, Dict[LabelValues, float]]]] = None,
+                 **kwargs):
+        super().__init__(*args, **kwargs)
+        self._values: Dict[LabelValues, float] = {}
+        self._function = function
+
+    def set(self, value: float, *labels: str):
+        self._values[labels] = value
+
+    def inc(self, *labels: str, amount: float = 1.0):
+        self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def dec(self, *labels: str, amount: float = 1.0):
+        self._values[labels] = self._values.get(labels, 0.0) - amount
+
+    def samples(self):
+        values = self._values
+        if self._function is not None:
+            result = self._function()
+            values = result if isinstance(result, dict) else {(): result}
+        for labels, value in list(values.items()):
+            yield self.name, self._labels(labels), value
+
+
+class Histogram(Metric):
+    type = 'histogram'
+
+    def __init__(self, *args, buckets: Sequence[float] = DEFAULT_BUCKETS, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.buckets = tuple(sorted(buckets))
+        # Per label set: [count per bucket..., count above last bucket], sum
+        self._values: Dict[LabelValues, Tuple[List[int], List[float]]] = {}
+
+    def observe(self, value: float, *labels: str):
+        entry = self._values.get(labels)
+        if entry is None:
+            entry = self._values[labels] = ([0] * (len(self.buckets) + 1), [0.0])
+        entry[0][bisect_left(self.buckets, value)] += 1
+        entry[1][0] += value
+
+    @contextmanager
+    def time(self, *labels: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, *labels)
+
+    def samples(self):
+        for labels, (counts, total) in list(self._values.items()):
+            base = self._labels(labels)
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float('inf'),), counts):
+                cumulative += count
+                yield f'{self.name}_bucket', base + (('le', _format_value(bound)),), cumulative
+            yield f'{self.name}_sum', base, total[0]
+            yield f'{self.name}_count', base, cumulative
+
+
+# HTTP
+http_requests = Counter(
+    'http_requests', 'HTTP requests by route template and status', ['method', 'route', 'status']
+)
+http_request_duration = Histogram(
+    'http_request_duration_seconds', 'HTTP request latency by route template', ['method', 'route']
+)
+http_requests_in_flight = Gauge('http_requests_in_flight', 'HTTP requests currently being served')
+
+# Redis and cache
+redis_command_duration = Histogram(
+    'redis_command_duration_seconds', 'Redis round-trip latency from CacheManager', ['operation'],
+    buckets=FAST_BUCKETS
+)
+cache_requests = Counter('cache_requests', 'Cache lookups by tier and result', ['tier', 'result'])
+
+
+def _cache_hit_ratio() -> Dict[LabelValues, float]:
+    ratios = {}
+    for tier in ('local', 'redis'):
+        hits = cache_requests.get(tier, 'hit')
+        total = hits + cache_requests.get(tier, 'miss')
+        if total:
+            ratios[(tier,)] = hits / total
+    return ratios
+
+
+cache_hit_ratio = Gauge('cache_hit_ratio', 'Cache hit ratio since startup', ['tier'], function=_cache_hit_ratio)
@@ -1,25 +1,139 @@
-from fastapi import Request, HTTPException, status
+from fastapi import status
 from fastapi.responses import JSONResponse
+from starlette.datastructures import Headers, MutableHeaders, URL
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+import logging
+import math
 import time
-from collections import defaultdict
-from typing import Dict
 
-request_counts: Dict[str, list] = defaultdict(list)
+from app.auth.jwt import decode_access_token
+from app.config.metrics import http_request_duration, http_requests, http_requests_in_flight
+from app.config.rate_limit import RateLimiter
+from app.config.setting import settings
+from app.db.query_stats import current_query_stats, start_query_stats, stop_query_stats
+from app.db.routing import request_user_id
+from app.services.metrics_service import metrics_collector
 
-async def rate_limit_middleware(request: Request, call_next):
-    client_ip = request.client.host
-    current_time = time.time()
+logger = logging.getLogger(__name__)
 
-    request_counts[client_ip] = [
-        req_time for req_time in request_counts[client_ip] if current_time - req_time < 60
-    ]
+rate_limiter = RateLimiter(
+    default_limit=settings.RATE_LIMIT_PER_MINUTE,
+    endpoint_limits=settings.RATE_LIMIT_ENDPOINTS,
+    local_max_keys=settings.RATE_LIMIT_LOCAL_MAX_KEYS,
+    sweep_interval=settings.RATE_LIMIT_SWEEP_INTERVAL
+)
 
-    if len(request_counts[client_ip]) >= 60:
-        return JSONResponse(
-            status_code=status.HTTP_429_TOO_MANY_REQUESTS, content={'detail': "Too many requests"}
-        )
-    
-    request_counts[client_ip].append(current_time)
+SLOW_REQUEST_SECONDS = 1.0
 
-    response = await call_next(request)
-    return response
\ No newline at end of file
+
+def _client_identity(scope: Scope) -> str:
+    """Authenticated requests are limited per user, anonymous ones per IP.
+
+    The decoded user id is kept in request state (for the metrics recorded
+    by TimingMiddleware) and in request_user_id (for replica routing), so
+    the token is only verified once per request.
+    """
+    authorization = Headers(scope=scope).get('authorization')
+    if authorization and authorization.lower().startswith('bearer '):
+        try:
+            user_id = decode_access_token(authorization[7:])
+            scope.setdefault('state', {})['user_id'] = user_id
+            request_user_id.set(user_id)
+            return f'user:{user_id}'
+        except Exception:
+            pass
+    client = scope.get('client')
+    return f'ip:{client[0] if client else "unknown"}'
+
+
+def _route_template(scope: Scope) -> str:
+    """Matched route path such as '/users/{user_id}', never the raw URL"""
+    route = scope.get('route')
+    return getattr(route, 'path', None) or 'unmatched'
+
+
+class RateLimitMiddleware:
+    """Rejects requests over the configured rate with 429"""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+
+        allowed, retry_after = await rate_limiter.hit(_client_identity(scope), scope['path'])
+
+        if not allowed:
+            response = JSONResponse(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                content={'detail': "Too many requests"},
+                headers={'Retry-After': str(max(1, math.ceil(retry_after)))}
+            )
+            await response(scope, receive, send)
+            return
+
+        await self.app(scope, receive, send)
+
+
+class TimingMiddleware:
+    """Adds X-Process-Time to responses, records request metrics and logs slow requests.
+
+    Also counts SQL statements issued while serving the request; the totals
+    are sent as X-DB-Queries / X-DB-Time in DEBUG and logged over budget.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+
+        start_time = time.perf_counter()
+        status_code = 500
+        http_requests_in_flight.inc()
+        stats_token = start_query_stats()
+        query_stats = current_query_stats()
+
+        async def send_with_timing(message: Message):
+            nonlocal status_code
+            if message['type'] == 'http.response.start':
+                status_code = message['status']
+                # Headers go out with the first message, so this is time to first byte
+                headers = MutableHeaders(scope=message)
+                headers['X-Process-Time'] = str(time.perf_counter() - start_time)
+                if settings.DEBUG:
+                    headers['X-DB-Queries'] = str(query_stats.count)
+                    headers['X-DB-Time'] = f'{query_stats.duration * 1000:.2f}'
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            process_time = time.perf_counter() - start_time
+            stop_query_stats(stats_token)
+            route = _route_template(scope)
+            http_requests_in_flight.dec()
+            http_request_duration.observe(process_time, scope['method'], route)
+            http_requests.inc(scope['method'], route, str(status_code))
+            if settings.METRICS_ENABLED:
+                client = scope.get('client')
+                metrics_collector.record(
+                    endpoint=route,
+                    method=scope['method'],
+                    status_code=status_code,
+                    response_time=process_time,
+                    user_id=scope.get('state', {}).get('user_id'),
+                    ip_address=client[0] if client else None
+                )
+            if process_time > SLOW_REQUEST_SECONDS:
+                logger.warning(f"Slow request: {scope['method']} {URL(scope=scope)} took {process_time:.2f}s")
+            db_time_ms = query_stats.duration * 1000
+            if query_stats.count > settings.DB_QUERY_BUDGET or db_time_ms > settings.DB_TIME_BUDGET_MS:
+                logger.warning(
+                    f"DB budget exceeded: {scope['method']} {route} ran {query_stats.count} queries "
+                    f"in {db_time_ms:.1f}ms"
+                )
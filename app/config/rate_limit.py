@@ -0,0 +1,144 @@
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+from redis.asyncio import Redis
+
+logger = logging.getLogger(__name__)
+
+# GCRA (generic cell rate algorithm): one key per identity holding the
+# "theoretical arrival time". Check and update happen in a single script call.
+# Returns {allowed, retry_after_ms, remaining}.
+_GCRA = """
+local interval = tonumber(ARGV[1])
+local period = tonumber(ARGV[2])
+local t = redis.call('TIME')
+local now = t[1] * 1000 + math.floor(t[2] / 1000)
+local tat = tonumber(redis.call('GET', KEYS[1])) or now
+if tat < now then
+    tat = now
+end
+local new_tat = tat + interval
+local allow_at = new_tat - period
+if now < allow_at then
+    return {0, math.ceil(allow_at - now), 0}
+end
+redis.call('SET', KEYS[1], new_tat, 'PX', math.ceil(new_tat - now))
+return {1, 0, math.floor((now - allow_at) / interval)}
+"""
+
+# Skip Redis for this long after an error instead of failing every request
+REDIS_RETRY_AFTER = 5.0
+
+
+class LocalTokenBucket:
+    """In-process token buckets with an LRU cap on tracked identifiers.
+
+    Each hit is O(1): one dict lookup, a refill computed from the elapsed
+    time and a move to the LRU tail. Buckets are kept in last-seen order, so
+    idle ones are always at the head and can be swept without a full scan.
+    """
+
+    def __init__(self, max_keys: int = 10000):
+        self.max_keys = max_keys
+        self._buckets: OrderedDict[str, Tuple[float, float]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+    def hit(self, key: str, limit: int, period: float) -> Tuple[bool, float]:
+        now = time.monotonic()
+        rate = limit / period
+        tokens, updated = self._buckets.get(key, (float(limit), now))
+        tokens = min(float(limit), tokens + (now - updated) * rate)
+
+        allowed = tokens >= 1
+        if allowed:
+            tokens -= 1
+
+        self._buckets[key] = (tokens, now)
+        self._buckets.move_to_end(key)
+        if len(self._buckets) > self.max_keys:
+            self._buckets.popitem(last=False)
+
+        return allowed, 0.0 if allowed else (1 - tokens) / rate
+
+    def sweep(self, idle_after: float) -> int:
+        """Drop buckets untouched for idle_after seconds; returns number evicted"""
+        cutoff = time.monotonic() - idle_after
+        evicted = 0
+        while self._buckets:
+            key, (_, updated) = next(iter(self._buckets.items()))
+            if updated >= cutoff:
+                break
+            del self._buckets[key]
+            evicted += 1
+        return evicted
+
+
+class RateLimiter:
+    """Distributed GCRA limiter in Redis with a local token-bucket fallback"""
+
+    def __init__(self, default_limit: int, endpoint_limits: Optional[Dict[str, int]] = None,
+                 period: float = 60.0, local_max_keys: int = 10000, sweep_interval: float = 30.0):
+        self.default_limit = default_limit
+        # Longest prefix first so '/auth/login' wins over '/auth'
+        self.endpoint_limits = sorted((endpoint_limits or {}).items(), key=lambda item: -len(item[0]))
+        self.period = period
+        self.local = LocalTokenBucket(local_max_keys)
+        self.redis: Optional[Redis] = None
+        self._gcra = None
+        self._redis_disabled_until = 0.0
+        self.sweep_interval = sweep_interval
+        self._sweeper: Optional[asyncio.Task] = None
+
+    def attach(self, redis_client: Optional[Redis]):
+        self.redis = redis_client
+        self._gcra = redis_client.register_script(_GCRA) if redis_client is not None else None
+
+    async def start(self, redis_client: Optional[Redis] = None):
+        self.attach(redis_client)
+        if self._sweeper is None:
+            self._sweeper = asyncio.create_task(self._sweep_periodically())
+
+    async def stop(self):
+        if self._sweeper:
+            self._sweeper.cancel()
+            try:
+                await self._sweeper
+            except asyncio.CancelledError:
+                pass
+            self._sweeper = None
+
+    def resolve_limit(self, path: str) -> Tuple[str, int]:
+        """Return (scope, requests per period) for a request path"""
+        for prefix, limit in self.endpoint_limits:
+            if path.startswith(prefix):
+                return prefix, limit
+        return 'global', self.default_limit
+
+    async def hit(self, identity: str, path: str) -> Tuple[bool, float]:
+        """Count one request; returns (allowed, retry_after_seconds)"""
+        scope, limit = self.resolve_limit(path)
+        key = f'rate_limit:{scope}:{identity}'
+
+        if self._gcra is not None and time.monotonic() >= self._redis_disabled_until:
+            try:
+                interval = self.period * 1000 / limit
+                allowed, retry_after_ms, _ = await self._gcra(keys=[key], args=[interval, self.period * 1000])
+                return bool(allowed), float(retry_after_ms) / 1000
+            except Exception as e:
+                logger.warning(f'Redis rate limiter unavailable, using local buckets: {e}')
+                self._redis_disabled_until = time.monotonic() + REDIS_RETRY_AFTER
+
+        return self.local.hit(key, limit, self.period)
+
+    async def _sweep_periodically(self):
+        while True:
+            await asyncio.sleep(self.sweep_interval)
+            # A bucket idle for a full period has refilled, so dropping it loses nothing
+            evicted = self.local.sweep(self.period)
+            if evicted:
+                logger.debug(f'Evicted {evicted} idle rate limit buckets, {len(self.local)} tracked')
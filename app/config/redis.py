@@ -7,6 +7,7 @@ logger = logging.getLogger(__name__)
 class RedisConnection:
     def __init__(self):
         self.redis: Redis = None
+        self.binary_redis: Redis = None
 
     async def connect(self) -> Redis:
         """Connect to Redis"""
@@ -24,8 +25,20 @@ class RedisConnection:
             logger.error(f"Failed to connect to Redis: {e}")
             raise
 
+    async def connect_binary(self) -> Redis:
+        """Connect a client that returns raw bytes (cache payloads are binary)"""
+        self.binary_redis = Redis.from_url(
+            settings.REDIS_URL,
+            decode_responses=False,
+            health_check_interval=30
+        )
+        await self.binary_redis.ping()
+        return self.binary_redis
+
     async def disconnect(self):
         """Disconnect from Redis"""
+        if self.binary_redis:
+            await self.binary_redis.close()
         if self.redis:
             await self.redis.close()
             logger.info("Disconnected from Redis")
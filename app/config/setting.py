@@ -1,5 +1,5 @@
 from pydantic_settings import BaseSettings, SettingsConfigDict
-from typing import Optional
+from typing import Dict, Optional
 
 class Settings(BaseSettings):
     POSTGRES_USER: str
@@ -8,25 +8,96 @@ class Settings(BaseSettings):
     POSTGRES_PORT: int = 5432
     POSTGRES_DB: str
 
-    JWT_SECRET_KEY: str
+    # HS* sign with JWT_SECRET_KEY; RS*/ES*/EdDSA take PEM keys (inline or file path).
+    # Services that only verify tokens need just JWT_PUBLIC_KEY.
+    JWT_SECRET_KEY: Optional[str] = None
     JWT_ALGORITHM: str = "HS256"
+    JWT_PRIVATE_KEY: Optional[str] = None
+    JWT_PUBLIC_KEY: Optional[str] = None
+    # LRU of verified tokens; entries live until min(exp, TTL seconds)
+    JWT_VERIFY_CACHE_SIZE: int = 4096
+    JWT_VERIFY_CACHE_TTL: int = 60
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
+    # Refresh tokens rotate on every use; each rotation restarts this lifetime
+    REFRESH_TOKEN_EXPIRE_DAYS: int = 7
+    # Seconds the authorization fields of a user are cached (explicitly invalidated on change)
+    PRINCIPAL_CACHE_TTL: int = 60
+    # Trust role/company/admin claims of signed access tokens without a lookup on read-only
+    # endpoints that depend on get_claims_principal (GET /resumes/me); needs Redis for revocation
+    AUTH_CLAIMS_PRINCIPAL: bool = False
+
+    # PBKDF2 rounds; stored hashes with other rounds are upgraded on login
+    PASSWORD_HASH_ROUNDS: int = 29000
+    PASSWORD_HASH_WORKERS: int = 4
 
     REDIS_HOST: str = 'localhost'
     REDIS_PORT: int = 6379
     REDIS_DB: int = 0
     REDIS_PASSWORD: Optional[str] = None
 
+    # In-process L1 cache in front of Redis (0 disables it)
+    CACHE_LOCAL_MAX_ITEMS: int = 1024
+    CACHE_LOCAL_TTL: int = 30
+
+    # Cache payload format: json | orjson | msgpack; compression: zlib | zstd | lz4
+    CACHE_SERIALIZER: str = 'orjson'
+    CACHE_COMPRESSION: Optional[str] = None
+    CACHE_COMPRESSION_THRESHOLD: int = 1024
+
+    # Seconds between batched job view_count flushes
+    JOB_VIEW_FLUSH_INTERVAL: float = 10.0
+
+    # Request metrics buffered in memory and batch-inserted into PerformanceMetric
+    METRICS_ENABLED: bool = True
+    METRICS_BUFFER_SIZE: int = 10000
+    METRICS_FLUSH_INTERVAL: float = 5.0
+    METRICS_BATCH_SIZE: int = 1000
+    # Bearer token Prometheus must send to /metrics; the endpoint is disabled while unset
+    METRICS_TOKEN: Optional[str] = None
+
+    # Connection pool (per engine)
+    DB_POOL_SIZE: int = 20
+    DB_MAX_OVERFLOW: int = 30
+    DB_POOL_TIMEOUT: int = 30
+    DB_POOL_RECYCLE: int = 3600
+    DB_POOL_PRE_PING: bool = True
+    DB_STATEMENT_CACHE_SIZE: int = 100
+
+    # Optional read replica (same credentials and database as the primary)
+    POSTGRES_REPLICA_HOST: Optional[str] = None
+    POSTGRES_REPLICA_PORT: Optional[int] = None
+    # Seconds a user's reads stay on the primary after they write
+    DB_READ_YOUR_WRITES_SECONDS: float = 5.0
+
+    # Log every SQL statement (development only)
+    DB_ECHO: bool = False
+    # Statements slower than this are logged; a sampled share also gets EXPLAIN (ANALYZE, BUFFERS)
+    DB_SLOW_QUERY_MS: Optional[float] = 200.0
+    DB_SLOW_QUERY_EXPLAIN_RATE: float = 0.0
+
+    # Per-request DB budget; requests above it are logged (X-DB-* headers in DEBUG)
+    DB_QUERY_BUDGET: int = 20
+    DB_TIME_BUDGET_MS: float = 250.0
+
     LOG_LEVEL: str = 'INFO'
     LOG_FILE: Optional[str] = None
 
     CORS_ORIGINS: list = ['http://localhost:3000']
     RATE_LIMIT_PER_MINUTE: int = 60
+    # Per-endpoint overrides (path prefix -> requests per minute)
+    RATE_LIMIT_ENDPOINTS: Dict[str, int] = {'/auth/login': 10, '/auth/register': 10}
+    # Identifiers tracked by the in-process fallback limiter
+    RATE_LIMIT_LOCAL_MAX_KEYS: int = 10000
+    RATE_LIMIT_SWEEP_INTERVAL: float = 30.0
 
     SMTP_SERVER: Optional[str] = None
     SMTP_PORT: int = 587 
     SMTP_USERNAME: Optional[str] = None  
     SMTP_PASSWORD: Optional[str] = None
+    # Persistent authenticated sessions (and sender threads) reused across emails
+    SMTP_POOL_SIZE: int = 4
+    SMTP_TIMEOUT: float = 30.0
+    SMTP_IDLE_TIMEOUT: float = 60.0
 
     ENVIRONMENT: str = 'development' 
     DEBUG: bool = False
@@ -37,6 +108,15 @@ class Settings(BaseSettings):
             f"postgresql+asyncpg://{self.POSTGRES_USER}:{self.POSTGRES_PASSWORD}@"
             f"{self.POSTGRES_HOST}:{self.POSTGRES_PORT}/{self.POSTGRES_DB}"
         )
+
+    @property
+    def REPLICA_DATABASE_URL(self) -> Optional[str]:
+        if not self.POSTGRES_REPLICA_HOST:
+            return None
+        return (
+            f"postgresql+asyncpg://{self.POSTGRES_USER}:{self.POSTGRES_PASSWORD}@"
+            f"{self.POSTGRES_REPLICA_HOST}:{self.POSTGRES_REPLICA_PORT or self.POSTGRES_PORT}/{self.POSTGRES_DB}"
+        )
     
     @property
     def REDIS_URL(self):
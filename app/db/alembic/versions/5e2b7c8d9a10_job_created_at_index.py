@@ -0,0 +1,28 @@
+"""job created_at keyset index
+
+Revision ID: 5e2b7c8d9a10
+Revises: c3f1a9d2e7b4
+Create Date: 2025-09-23 09:41:55.204117
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5e2b7c8d9a10'
+down_revision: Union[str, Sequence[str], None] = 'c3f1a9d2e7b4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('idx_job_created_id', 'job', ['created_at', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('idx_job_created_id', table_name='job')
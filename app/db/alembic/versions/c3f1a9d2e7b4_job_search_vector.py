@@ -0,0 +1,44 @@
+"""job search vector
+
+Revision ID: c3f1a9d2e7b4
+Revises: 8ce0c1023e83
+Create Date: 2025-09-22 10:04:12.518330
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c3f1a9d2e7b4'
+down_revision: Union[str, Sequence[str], None] = '8ce0c1023e83'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('job', sa.Column('search_vector', postgresql.TSVECTOR(), nullable=True))
+    op.create_index('idx_job_search_vector', 'job', ['search_vector'], unique=False, postgresql_using='gin')
+
+    # Backfill existing rows with the same document JobService maintains
+    op.execute("""
+        UPDATE job SET search_vector =
+            setweight(to_tsvector('english'::regconfig, coalesce(job.title, '')), 'A') ||
+            setweight(to_tsvector('english'::regconfig, concat_ws(' ',
+                (SELECT string_agg(skill.name, ' ') FROM job_skills JOIN skill ON skill.id = job_skills.skill_id
+                 WHERE job_skills.job_id = job.id),
+                (SELECT string_agg(tag.name, ' ') FROM job_tags JOIN tag ON tag.id = job_tags.tag_id
+                 WHERE job_tags.job_id = job.id)
+            )), 'B') ||
+            setweight(to_tsvector('english'::regconfig, coalesce(job.description, '')), 'C')
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('idx_job_search_vector', table_name='job', postgresql_using='gin')
+    op.drop_column('job', 'search_vector')
@@ -1,26 +1,95 @@
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
-from sqlalchemy.orm import DeclarativeBase, mapped_column, Mapped, declared_attr
-from sqlalchemy import func
-from sqlalchemy.pool import QueuePool
+from sqlalchemy.orm import DeclarativeBase, Session, mapped_column, Mapped, declared_attr
+from sqlalchemy import event, func
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 from typing import Annotated
 from datetime import datetime
+import time
 from app.config.setting import settings
+from app.config.metrics import Gauge, Histogram, FAST_BUCKETS
+from app.db.query_stats import instrument_engine
+from app.db.routing import ReplicaRouter, request_user_id
 
-engine = create_async_engine(
-    settings.DATABASE_URL, 
-    echo=True,  
-    pool_size=20,        
-    max_overflow=30,      
-    pool_timeout=30,      
-    pool_recycle=3600,    
-    # pool_pre_ping=True,   
+db_pool_checkout_duration = Histogram(
+    'db_pool_checkout_duration_seconds', 'Time waiting for a pooled connection (including new connects)',
+    buckets=FAST_BUCKETS
 )
-async_session = async_sessionmaker(engine, expire_on_commit=False, class_=AsyncSession)
+
+
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    """Queue pool that records how long each checkout waits for a connection"""
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            db_pool_checkout_duration.observe(time.perf_counter() - start)
+
+
+def _create_engine(url: str):
+    engine = create_async_engine(
+        url,
+        echo=settings.DB_ECHO,
+        poolclass=InstrumentedQueuePool,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+        pool_pre_ping=settings.DB_POOL_PRE_PING,
+        # asyncpg server-side prepared statements per connection (0 disables, e.g. behind pgbouncer)
+        connect_args={'statement_cache_size': settings.DB_STATEMENT_CACHE_SIZE},
+    )
+    instrument_engine(
+        engine.sync_engine,
+        slow_query_ms=settings.DB_SLOW_QUERY_MS,
+        explain_sample_rate=settings.DB_SLOW_QUERY_EXPLAIN_RATE
+    )
+    return engine
+
+
+class PrimarySession(Session):
+    """Sync session class behind primary AsyncSessions"""
+
+
+engine = _create_engine(settings.DATABASE_URL)
+async_session = async_sessionmaker(
+    engine, expire_on_commit=False, class_=AsyncSession, sync_session_class=PrimarySession
+)
+
+# Read-only traffic; falls back to the primary when no replica is configured
+replica_engine = _create_engine(settings.REPLICA_DATABASE_URL) if settings.REPLICA_DATABASE_URL else engine
+replica_session = async_sessionmaker(replica_engine, expire_on_commit=False, class_=AsyncSession)
+
+replica_router = ReplicaRouter(settings.DB_READ_YOUR_WRITES_SECONDS)
+
+
+@event.listens_for(PrimarySession, 'after_commit')
+def _pin_writer_to_primary(session):
+    replica_router.mark_write(request_user_id.get())
+
+
+Gauge('db_pool_size', 'Configured connection pool size', function=lambda: engine.pool.size())
+Gauge('db_pool_checked_out', 'Connections currently checked out', function=lambda: engine.pool.checkedout())
+Gauge('db_pool_checked_in', 'Idle connections in the pool', function=lambda: engine.pool.checkedin())
+Gauge('db_pool_overflow', 'Connections open beyond pool_size', function=lambda: engine.pool.overflow())
 
 async def get_session() -> AsyncSession:
     async with async_session() as session:
         yield session
 
+async def read_session_factory() -> async_sessionmaker:
+    """Replica session factory, or the primary's right after the user's own write"""
+    if replica_engine is engine or await replica_router.use_primary(request_user_id.get()):
+        return async_session
+    return replica_session
+
+async def get_read_session() -> AsyncSession:
+    """Session for read-only service methods: replica, or primary right after the user's own write"""
+    factory = await read_session_factory()
+    async with factory() as session:
+        yield session
+
 pk_int = Annotated[int, mapped_column(primary_key=True)]
 created_at = Annotated[datetime, mapped_column(default=func.now())]
 updated_at = Annotated[datetime, mapped_column(default=func.now(), onupdate=func.now())]
@@ -0,0 +1,172 @@
+import logging
+import random
+import re
+import sys
+import time
+from contextvars import ContextVar, Token
+from typing import Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+try:
+    import greenlet
+except ImportError:
+    greenlet = None
+
+logger = logging.getLogger(__name__)
+
+_WHITESPACE = re.compile(r'\s+')
+_PLACEHOLDER = re.compile(r'\$\d+|%\(\w+\)s|\?')
+_PLACEHOLDER_LIST = re.compile(r'\?(?:\s*,\s*\?)+')
+_NUMBER = re.compile(r'\b\d+\b')
+_STRING = re.compile(r"'(?:[^']|'')*'")
+
+
+class QueryStats:
+    """Number of statements and total DB time for one request"""
+    __slots__ = ('count', 'duration')
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+
+
+_current_stats: ContextVar[Optional[QueryStats]] = ContextVar('query_stats', default=None)
+
+
+def start_query_stats() -> Token:
+    """Start counting statements for the current request; pass the token to stop_query_stats"""
+    return _current_stats.set(QueryStats())
+
+
+def stop_query_stats(token: Token):
+    _current_stats.reset(token)
+
+
+def current_query_stats() -> Optional[QueryStats]:
+    return _current_stats.get()
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault('query_start_time', []).append(time.perf_counter())
+
+
+def _record_query(conn) -> float:
+    """Add the finished statement to the request's stats; returns its duration in seconds"""
+    elapsed = time.perf_counter() - conn.info['query_start_time'].pop()
+    # SQLAlchemy runs the sync events in a greenlet that shares the request's context
+    stats = _current_stats.get()
+    if stats is not None:
+        stats.count += 1
+        stats.duration += elapsed
+    return elapsed
+
+
+def normalize_sql(statement: str) -> str:
+    """Collapse whitespace, literals and placeholder lists so equal queries log identically"""
+    normalized = _STRING.sub('?', statement)
+    normalized = _PLACEHOLDER.sub('?', normalized)
+    normalized = _NUMBER.sub('?', normalized)
+    normalized = _PLACEHOLDER_LIST.sub('?, ...', normalized)
+    return _WHITESPACE.sub(' ', normalized).strip()
+
+
+def _parameter_count(parameters, executemany: bool) -> int:
+    if not parameters:
+        return 0
+    if executemany:
+        return sum(len(params) for params in parameters)
+    return len(parameters)
+
+
+def _find_caller() -> str:
+    """First application frame outside app.db that issued the statement.
+
+    The sync event runs in SQLAlchemy's worker greenlet; the awaiting
+    coroutines (service methods) are on the parent greenlet's stack.
+    """
+    frame = None
+    if greenlet is not None:
+        parent = greenlet.getcurrent().parent
+        frame = parent.gr_frame if parent is not None else None
+    frame = frame or sys._getframe()
+
+    while frame is not None:
+        module = frame.f_globals.get('__name__', '')
+        if module.startswith('app.') and not module.startswith('app.db'):
+            # co_qualname is Python 3.11+, the image runs 3.9
+            name = getattr(frame.f_code, 'co_qualname', frame.f_code.co_name)
+            return f'{module}.{name}:{frame.f_lineno}'
+        frame = frame.f_back
+    return 'unknown'
+
+
+def _log_slow_query(conn, statement: str, parameters, executemany: bool, elapsed: float, explain_rate: float):
+    normalized = normalize_sql(statement)
+    caller = _find_caller()
+    param_count = _parameter_count(parameters, executemany)
+    logger.warning(
+        f'Slow query {elapsed * 1000:.1f}ms params={param_count} caller={caller} sql={normalized}',
+        extra={
+            'duration_ms': round(elapsed * 1000, 2),
+            'param_count': param_count,
+            'caller': caller,
+            'sql': normalized
+        }
+    )
+
+    if explain_rate and not executemany and random.random() < explain_rate:
+        plan = _explain_analyze(conn, statement, parameters)
+        if plan:
+            logger.warning(f'Slow query plan for {caller}:\n{plan}')
+
+
+def _explain_analyze(conn, statement: str, parameters) -> Optional[str]:
+    """EXPLAIN (ANALYZE, BUFFERS) a read-only statement inside a savepoint"""
+    head = statement.lstrip().upper()
+    if not head.startswith('SELECT') or 'FOR UPDATE' in head or 'FOR SHARE' in head:
+        return None
+
+    # ANALYZE executes the query again, so failures must not poison the transaction
+    cursor = conn.connection.cursor()
+    try:
+        cursor.execute('SAVEPOINT slow_query_explain')
+        try:
+            cursor.execute(f'EXPLAIN (ANALYZE, BUFFERS) {statement}', parameters)
+            plan = '\n'.join(row[0] for row in cursor.fetchall())
+            cursor.execute('RELEASE SAVEPOINT slow_query_explain')
+            return plan
+        except Exception as e:
+            cursor.execute('ROLLBACK TO SAVEPOINT slow_query_explain')
+            logger.error(f'Failed to capture slow query plan: {e}')
+            return None
+    except Exception as e:
+        logger.error(f'Failed to capture slow query plan: {e}')
+        return None
+    finally:
+        cursor.close()
+
+
+def _handle_error(exception_context):
+    starts = exception_context.connection.info.get('query_start_time') if exception_context.connection else None
+    if starts:
+        starts.pop()
+
+
+def instrument_engine(engine: Engine, slow_query_ms: Optional[float] = None, explain_sample_rate: float = 0.0):
+    """Attach query counting and slow query logging hooks to a (sync) engine.
+
+    The slow query settings belong to this engine's listener only, so
+    instrumenting another engine (replica, tests) does not change them.
+    """
+    threshold = slow_query_ms / 1000 if slow_query_ms else None
+
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        elapsed = _record_query(conn)
+        if threshold is not None and elapsed >= threshold:
+            _log_slow_query(conn, statement, parameters, executemany, elapsed, explain_sample_rate)
+
+    event.listen(engine, 'before_cursor_execute', _before_cursor_execute)
+    event.listen(engine, 'after_cursor_execute', after_cursor_execute)
+    event.listen(engine, 'handle_error', _handle_error)
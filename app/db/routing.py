@@ -0,0 +1,81 @@
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from contextvars import ContextVar
+from typing import Optional, Set
+
+from redis.asyncio import Redis
+
+
+logger = logging.getLogger(__name__)
+
+# Authenticated user of the current request, set by the HTTP middleware
+request_user_id: ContextVar[Optional[int]] = ContextVar('request_user_id', default=None)
+
+
+class ReplicaRouter:
+    """Decides whether a request's reads may go to the replica.
+
+    After a user commits a write, their reads stay on the primary for
+    `sticky_seconds` so they see their own changes despite replica lag.
+    Recent writers are kept locally and, when Redis is attached, in a
+    shared key so every worker honours the window.
+    """
+
+    def __init__(self, sticky_seconds: float = 5.0, max_local: int = 10000):
+        self.sticky_seconds = sticky_seconds
+        self.max_local = max_local
+        self.redis: Optional[Redis] = None
+        self._recent_writers: OrderedDict[int, float] = OrderedDict()
+        self._pending: Set[asyncio.Task] = set()
+
+    def attach(self, redis_client: Optional[Redis]):
+        self.redis = redis_client
+
+    @staticmethod
+    def _sticky_key(user_id: int) -> str:
+        return f'db_sticky:{user_id}'
+
+    def mark_write(self, user_id: Optional[int]):
+        """Pin user_id to the primary; safe to call from sync session events"""
+        if user_id is None or self.sticky_seconds <= 0:
+            return
+
+        self._recent_writers[user_id] = time.monotonic() + self.sticky_seconds
+        self._recent_writers.move_to_end(user_id)
+        while len(self._recent_writers) > self.max_local:
+            self._recent_writers.popitem(last=False)
+
+        if self.redis is not None:
+            try:
+                task = asyncio.get_running_loop().create_task(
+                    self.redis.set(self._sticky_key(user_id), 1, px=int(self.sticky_seconds * 1000))
+                )
+            except RuntimeError:
+                return
+            self._pending.add(task)
+            task.add_done_callback(self._write_done)
+
+    def _write_done(self, task: asyncio.Task):
+        self._pending.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            logger.warning(f'Failed to share read-your-writes marker: {task.exception()}')
+
+    async def use_primary(self, user_id: Optional[int]) -> bool:
+        if user_id is None or self.sticky_seconds <= 0:
+            return False
+
+        until = self._recent_writers.get(user_id)
+        if until is not None:
+            if until > time.monotonic():
+                return True
+            del self._recent_writers[user_id]
+
+        if self.redis is not None:
+            try:
+                return bool(await self.redis.exists(self._sticky_key(user_id)))
+            except Exception as e:
+                logger.warning(f'Read-your-writes check failed, reading from primary: {e}')
+                return True
+        return False
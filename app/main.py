@@ -1,9 +1,11 @@
-from fastapi import FastAPI, Request, HTTPException
+from fastapi import FastAPI, HTTPException, Header
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
 from fastapi.exceptions import RequestValidationError
+import hmac
 import time
 import logging
+from typing import Optional
 
 from app.routers import auth, email, passwords, users, resumes
 from app.config.setting import settings
@@ -15,7 +17,8 @@ from app.config.error_handler import (
     validation_exception_handler  
 )
 from app.config.exceptions import BaseAppException
-from app.config.middleware import rate_limit_middleware
+from app.config.middleware import RateLimitMiddleware, TimingMiddleware
+from app.config.metrics import REGISTRY, CONTENT_TYPE
 
 
 logger = logging.getLogger(__name__)
@@ -37,24 +40,9 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Custom middleware for rate limiting
-@app.middleware("http")
-async def rate_limiting_middleware(request: Request, call_next):
-    return await rate_limit_middleware(request, call_next)
-
-# Request timing middleware
-@app.middleware("http")
-async def timing_middleware(request: Request, call_next):
-    start_time = time.time()
-    response = await call_next(request)
-    process_time = time.time() - start_time
-    response.headers["X-Process-Time"] = str(process_time)
-    
-    # Log slow requests
-    if process_time > 1.0:
-        logger.warning(f"Slow request: {request.method} {request.url} took {process_time:.2f}s")
-    
-    return response
+# Rate limiting and request timing (added last, so timing is outermost)
+app.add_middleware(RateLimitMiddleware)
+app.add_middleware(TimingMiddleware)
 
 # Exception handlers - ИСПРАВЛЕНО
 app.add_exception_handler(BaseAppException, app_exception_handler)
@@ -71,6 +59,16 @@ async def health_check():
         "environment": settings.ENVIRONMENT
     }
 
+# Prometheus scrape endpoint
+@app.get("/metrics", include_in_schema=False)
+async def metrics(authorization: Optional[str] = Header(None)):
+    if not settings.METRICS_TOKEN:
+        raise HTTPException(status_code=404, detail="Not Found")
+    expected = f"Bearer {settings.METRICS_TOKEN}".encode()
+    if not authorization or not hmac.compare_digest(authorization.encode(), expected):
+        raise HTTPException(status_code=401, detail="Invalid metrics token")
+    return Response(REGISTRY.render(), media_type=CONTENT_TYPE)
+
 # Include routers
 app.include_router(auth.router, prefix="/auth", tags=["Authentication"])
 app.include_router(email.router, prefix="/email", tags=["Email"])
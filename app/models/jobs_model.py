@@ -1,10 +1,14 @@
 from app.db.database import Base, pk_int
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy import String, Boolean, ForeignKey, Float, Integer, Index, Enum as SQLEnum, CheckConstraint, Table, Column, ARRAY, Text
+from sqlalchemy.dialects.postgresql import TSVECTOR
 from datetime import datetime
 from typing import Optional
 from app.utils.enums import EducationLevel, SkillLevel, EmploymentType
 
+# Text search configuration used for Job.search_vector and search queries
+JOB_SEARCH_CONFIG = 'english'
+
 # Association tables
 job_skills = Table(
     'job_skills',
@@ -141,6 +145,10 @@ class Job(Base):
     deleted_at: Mapped[Optional[datetime]] = mapped_column(nullable=True)
     deleted_by: Mapped[Optional[int]] = mapped_column(ForeignKey('user.id'), nullable=True)
 
+    # Weighted full-text document: title (A) > skills/tags (B) > description (C).
+    # Maintained by JobService because skills/tags live in association tables.
+    search_vector: Mapped[Optional[str]] = mapped_column(TSVECTOR, nullable=True, deferred=True)
+
     # Relationships
     category: Mapped["Categories"] = relationship("Categories", back_populates="jobs")
     applications: Mapped[list["Application"]] = relationship(
@@ -185,6 +193,8 @@ class Job(Base):
         Index('idx_job_location_salary', 'location', 'salary'),
         Index('idx_job_category_featured', 'category_id', 'is_featured', 'priority_score'),
         Index('idx_job_active_approved_featured', 'is_active', 'is_approved', 'is_featured'),
+        Index('idx_job_search_vector', 'search_vector', postgresql_using='gin'),
+        Index('idx_job_created_id', 'created_at', 'id'),
 
         CheckConstraint('salary > 0', name='check_positive_salary'),
         CheckConstraint('expires_at > created_at', name='check_future_expiry'),
@@ -1,5 +1,5 @@
 from app.db.database import Base, pk_int 
-from app.auth.hash import hash_password, verify_password
+from app.auth.hash import password_hasher
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy import Boolean, String, Enum as SQLEnum, Index, ForeignKey, ARRAY
 from app.utils.enums import UserRole
@@ -88,14 +88,17 @@ class User(Base):
         Index('idx_user_reset_token', 'password_reset_token'),
     )
 
-    def set_password(self, password: str):
+    async def set_password(self, password: str):
         """Set hashed password and update last_password_change"""
-        self.hashed_password = hash_password(password)
+        self.hashed_password = await password_hasher.hash(password)
         self.last_password_change = datetime.utcnow()
     
-    def verify_password(self, password: str) -> bool:
-        """Verify password against stored hash"""
-        return verify_password(password, self.hashed_password)
+    async def verify_password(self, password: str) -> bool:
+        """Verify password against stored hash, upgrading the hash if its parameters are outdated"""
+        valid, new_hash = await password_hasher.verify_and_update(password, self.hashed_password)
+        if valid and new_hash:
+            self.hashed_password = new_hash
+        return valid
     
     def is_locked(self) -> bool:
         """Check if account is currently locked"""
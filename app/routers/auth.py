@@ -6,14 +6,16 @@ from datetime import timedelta
 from app.db.database import get_session
 from app.config.setting import settings
 from app.schemas.user_schema import (
-    UserRequest, UserResponse, TokenResponse, UserLogin,
+    UserRequest, UserResponse, UserPrincipal, TokenResponse, UserLogin, RefreshTokenRequest,
     PasswordResetRequest, PasswordResetConfirm,
     EmailVerificationRequest, EmailVerificationConfirm
 )
 from app.utils import dto
 from app.services.users_service import user_service 
-from app.auth.jwt import create_access_token, create_refresh_token
-from app.auth.deps import get_client_ip, get_current_user
+from app.auth.jwt import create_access_token, create_refresh_token, decode_access_claims, decode_refresh_claims
+from app.auth.deps import get_client_ip, get_current_user, get_current_principal, oauth2_scheme
+from app.auth.revocation import token_revocations
+from app.auth.refresh_tokens import refresh_tokens
 from app.utils.audit import audit_service
 from app.config.user_exceptions import (
     EmailAlreadyExistsError, InvalidCredentialsError,
@@ -24,6 +26,16 @@ import logging
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
+
+def _issue_tokens(principal: UserPrincipal, family: str, jti: str) -> tuple:
+    """Access/refresh token pair of one refresh token family"""
+    # Principal claims let role-gated endpoints skip the user lookup (AUTH_CLAIMS_PRINCIPAL)
+    access_token = create_access_token({
+        "sub": principal.id, "fam": family, **principal.model_dump(mode='json', exclude={'id'})
+    })
+    refresh_token = create_refresh_token({"sub": principal.id, "fam": family, "jti": jti})
+    return access_token, refresh_token
+
 @router.post("/register", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
 async def register_user(
     user_data: UserRequest,
@@ -64,8 +76,8 @@ async def login(
             ip_address="127.0.0.1"  # Get from request in production
         )
         
-        access_token = create_access_token({"sub": user.id, "role": user.role.value})
-        refresh_token = create_refresh_token({"sub": user.id})
+        family, jti = await refresh_tokens.issue(user.id)
+        access_token, refresh_token = _issue_tokens(dto.map_user_to_principal(user), family, jti)
 
         return {
     "access_token": access_token,
@@ -86,6 +98,42 @@ async def login(
             detail=f"Login failed: {str(e)}"
         )
 
+@router.post("/refresh")
+async def refresh_access_token(
+    data: RefreshTokenRequest,
+    db: AsyncSession = Depends(get_session)
+):
+    """Exchange a refresh token for a new access/refresh token pair"""
+    claims = decode_refresh_claims(data.refresh_token)
+    try:
+        jti = await refresh_tokens.rotate(claims)
+    except InvalidTokenError as e:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail=str(e)
+        )
+    except Exception as e:
+        logger.error(f"Refresh token store unavailable: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Token refresh is temporarily unavailable"
+        )
+
+    user = await user_service.get_user_by_id(db, int(claims["sub"]))
+    if not user or not user.is_active:
+        await refresh_tokens.revoke_family(claims["fam"])
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Account is deactivated"
+        )
+
+    access_token, refresh_token = _issue_tokens(dto.map_user_to_principal(user), claims["fam"], jti)
+    return {
+        "access_token": access_token,
+        "refresh_token": refresh_token,
+        "token_type": "bearer"
+    }
+
 @router.get("/me", response_model=UserResponse)
 async def get_current_user_info(
     current_user: UserResponse = Depends(get_current_user)
@@ -96,11 +144,17 @@ async def get_current_user_info(
 @router.post("/logout")
 async def logout_user(
     request: Request,
-    current_user: UserResponse = Depends(get_current_user),
+    token: str = Depends(oauth2_scheme),
+    current_user: UserPrincipal = Depends(get_current_principal),
     db: AsyncSession = Depends(get_session)
 ):
-    """Logout user (for logging purposes)"""
+    """Logout user and revoke the access token and its refresh token family"""
     ip_address = await get_client_ip(request)
+
+    claims = decode_access_claims(token)
+    await token_revocations.revoke_token(claims)
+    if claims.get("fam"):
+        await refresh_tokens.revoke_family(claims["fam"])
     
     # Log logout
     await audit_service.log_user_action(
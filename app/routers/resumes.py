@@ -3,8 +3,9 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from app.models.resumes_model import Resume
 from app.models.users_model import User
 from app.schemas.resume_schema import ResumeCreate, ResumeResponse, ResumeUpdate
-from app.db.database import get_session
-from app.auth.deps import get_current_user
+from app.schemas.user_schema import UserPrincipal
+from app.db.database import get_read_session, get_session
+from app.auth.deps import get_claims_principal, get_current_user
 from app.services.resumes_service import resume_service
 from typing import List
 
@@ -29,5 +30,5 @@ async def set_default_resume(resume_id: int, db: AsyncSession = Depends(get_sess
     return await resume_service.set_default_resume_service(resume_id, db, current_user)
 
 @router.get('/me', response_model=List[ResumeResponse])
-async def get_my_resumes(db: AsyncSession = Depends(get_session), current_user: User = Depends(get_current_user)):
+async def get_my_resumes(db: AsyncSession = Depends(get_read_session), current_user: UserPrincipal = Depends(get_claims_principal)):
     return await resume_service.get_my_resumes_service(db, current_user)
\ No newline at end of file
@@ -1,7 +1,8 @@
 from fastapi import APIRouter, Depends
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.db.database import get_session
-from app.auth.deps import get_current_user
+from app.auth.deps import get_current_user, oauth2_scheme
+from app.auth.jwt import decode_access_claims
 from app.models.users_model import User
 from app.schemas.user_schema import ChangePasswordRequest
 from app.services.users_service import user_service
@@ -18,7 +19,10 @@ async def delete_my_account(
 
 @router.post('/change-password')
 async def change_password(request: ChangePasswordRequest,
+    token: str = Depends(oauth2_scheme),
     db: AsyncSession = Depends(get_session),
     current_user: User = Depends(get_current_user)):
-    await user_service.change_password_service(request, db, current_user)
+    # Other sessions are signed out; this one keeps its token family
+    family = decode_access_claims(token).get("fam")
+    await user_service.change_password_service(request, db, current_user, keep_family=family)
     return {"message": "Password changed successfully"}
\ No newline at end of file
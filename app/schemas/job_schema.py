@@ -168,18 +168,25 @@ class JobSearchParams(BaseModel):
     skill_search: Optional[str] = Field(None, min_length=1, description="Search in technical skills")
     tag_search: Optional[str] = Field(None, min_length=1, description="Search in tags")
     title_search: Optional[str] = Field(None, min_length=1, description="Search in job titles")
+    query: Optional[str] = Field(None, min_length=1, max_length=200, description="Full-text search in title, skills, tags and description")
     
     # Status filters
     is_active: Optional[bool] = Field(default=True)
     include_expired: bool = Field(default=False, description="Include expired jobs in results")
     
     # Sorting
-    sort_by: Optional[str] = Field(default="created_at", pattern="^(created_at|salary|expires_at|title)$")
+    sort_by: Optional[str] = Field(default="created_at", pattern="^(created_at|salary|expires_at|title|relevance)$",
+                                   description="'relevance' ranks full-text matches and requires query")
     sort_order: Optional[str] = Field(default="desc", pattern="^(asc|desc)$")
     
     # Pagination
     page: int = Field(default=1, ge=1, description="Page number")
     page_size: int = Field(default=20, ge=1, le=100, description="Items per page")
+    pagination: str = Field(default="offset", pattern="^(offset|cursor)$",
+                            description="'cursor' uses keyset pagination and returns next_cursor instead of page totals")
+    cursor: Optional[str] = Field(None, description="Opaque cursor from a previous response (cursor pagination only)")
+    count_strategy: str = Field(default="exact", pattern="^(exact|estimated|cached|window)$",
+                                description="How 'total' is computed for offset pagination")
 
     @model_validator(mode='after')
     @classmethod
@@ -31,6 +31,9 @@ class TokenResponse(BaseModel):
     expires_in: int = Field(description="Token expiration time in seconds")
     user: "UserResponse"  
 
+class RefreshTokenRequest(BaseModel):
+    refresh_token: str
+
 # ===== USER RESPONSE & PROFILE =====
 class UserResponse(BaseModel):
     id: int
@@ -48,6 +51,15 @@ class UserResponse(BaseModel):
 
     model_config = ConfigDict(from_attributes=True) 
 
+class UserPrincipal(BaseModel):
+    """Authorization fields of the current user, cached between requests"""
+    id: int
+    role: UserRole
+    is_active: bool = True
+    is_admin: bool = False
+    email_verified: bool = False
+    company_id: Optional[int] = None
+
 class UserProfile(BaseModel):
     """Extended user profile information"""
     id: int
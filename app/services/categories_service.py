@@ -10,16 +10,19 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.schemas.job_schema import CategoryCreate, CategoryResponse, CategoryStats, CategoryUpdate
 from app.models.jobs_model import Categories, Job
-from app.config.cache import CacheManager
+from app.config.cache import CacheManager, CATEGORIES_NAMESPACE, JOB_SEARCH_NAMESPACE
 from app.config.exceptions import BusinessLogicError, EntityNotFoundError, ValidationError
 
 
 logger = logging.getLogger(__name__)
 
 class CategoryService:
-    def __init__(self, session: AsyncSession, cache_manager: Optional[CacheManager] = None):
+    def __init__(self, session: AsyncSession, cache_manager: Optional[CacheManager] = None,
+                 read_session: Optional[AsyncSession] = None):
         self.cache = cache_manager
         self.session = session
+        # Replica session for read-only listings; defaults to the primary
+        self.read_session = read_session or session
         self.cache_ttl = 3600
 
     @asynccontextmanager
@@ -67,12 +70,13 @@ class CategoryService:
                 
                 await self.session.refresh(category, ['children'])
 
-                if self.cache:
-                    await self._invalidate_category_caches()
-                
+            # After the commit, so concurrent readers cannot re-cache pre-commit data
+            if self.cache:
+                await self._invalidate_category_caches()
+            
 
-                logger.info(f"Category created successfully: ID {category.id}, Name: '{category.name}'")
-                return self._convert_to_response(category)
+            logger.info(f"Category created successfully: ID {category.id}, Name: '{category.name}'")
+            return self._convert_to_response(category)
         except IntegrityError as e:
             logger.error(f'Database integrity error creating category: {str(e)}')
             raise ValidationError('Category creation failed due to data constraint violation')
@@ -86,7 +90,7 @@ class CategoryService:
 
         cache_key = f"category:{cat_id}"
         if self.cache and use_cache:
-            cached = await self.cache.get(cache_key)
+            cached = await self.cache.get(cache_key, namespace=CATEGORIES_NAMESPACE)
             if cached:
                 logger.debug(f"Category {cat_id} returned from cache")
                 return CategoryResponse.model_validate(cached)
@@ -101,7 +105,7 @@ class CategoryService:
             category_response =self._convert_to_response(category)
 
             if self.cache and use_cache:
-                await self.cache.set(cache_key, category_response.model_dump(), expire=self.cache_ttl)
+                await self.cache.set(cache_key, category_response.model_dump(), expire=self.cache_ttl, namespace=CATEGORIES_NAMESPACE)
 
             return category_response 
         except SQLAlchemyError as e:
@@ -117,7 +121,7 @@ class CategoryService:
         cache_key = f"categories:active_{active_only}:jobs_{include_job_count}"
 
         if self.cache and use_cache:
-            cached = await self.cache.get(cache_key)
+            cached = await self.cache.get(cache_key, namespace=CATEGORIES_NAMESPACE)
             if cached:
                 logger.debug("Categories returned from cache")
                 return [CategoryResponse.model_validate(cat) for cat in cached]
@@ -150,7 +154,7 @@ class CategoryService:
             
             stmt = stmt.order_by(Categories.name)
 
-            result = await self.session.execute(stmt)
+            result = await self.read_session.execute(stmt)
 
             if include_job_count:
                 categories_with_count = result.all()
@@ -166,7 +170,7 @@ class CategoryService:
             
             if self.cache and use_cache:
                 cache_data = [cat.model_dump() for cat in categories]
-                await self.cache.set(cache_key, cache_data, expire=self.cache_ttl)
+                await self.cache.set(cache_key, cache_data, expire=self.cache_ttl, namespace=CATEGORIES_NAMESPACE)
 
             logger.debug(f"Retrieved {len(categories)} categories")
             return categories 
@@ -211,11 +215,12 @@ class CategoryService:
                 
                 await self.session.refresh(category, ['children'])
                 
-                if self.cache:
-                    await self._invalidate_category_caches()
-                
-                logger.info(f"Category {cat_id} updated successfully")
-                return self._convert_to_response(category)
+            # After the commit, so concurrent readers cannot re-cache pre-commit data
+            if self.cache:
+                await self._invalidate_category_caches()
+            
+            logger.info(f"Category {cat_id} updated successfully")
+            return self._convert_to_response(category)
                 
         except SQLAlchemyError as e:
             logger.error(f"Database error updating category {cat_id}: {str(e)}")
@@ -262,11 +267,12 @@ class CategoryService:
                     await self.session.delete(category)
                     message = "Category permanently deleted"
                 
-                if self.cache:
-                    await self._invalidate_category_caches()
-                
-                logger.info(f"Category {cat_id} deleted successfully")
-                return {'message': message}
+            # After the commit, so concurrent readers cannot re-cache pre-commit data
+            if self.cache:
+                await self._invalidate_category_caches()
+            
+            logger.info(f"Category {cat_id} deleted successfully")
+            return {'message': message}
                 
         except SQLAlchemyError as e:
             logger.error(f"Database error deleting category {cat_id}: {str(e)}")
@@ -276,7 +282,7 @@ class CategoryService:
         cache_key = "category_tree"
         
         if self.cache and use_cache:
-            cached = await self.cache.get(cache_key)
+            cached = await self.cache.get(cache_key, namespace=CATEGORIES_NAMESPACE)
             if cached:
                 logger.debug("Category tree returned from cache")
                 return [CategoryResponse.model_validate(cat) for cat in cached]
@@ -294,7 +300,7 @@ class CategoryService:
             
             if self.cache and use_cache:
                 cache_data = [cat.model_dump() for cat in root_categories]
-                await self.cache.set(cache_key, cache_data, expire=self.cache_ttl)
+                await self.cache.set(cache_key, cache_data, expire=self.cache_ttl, namespace=CATEGORIES_NAMESPACE)
             
             return root_categories
             
@@ -370,15 +376,8 @@ class CategoryService:
         if not self.cache:
             return
         
-        cache_patterns = [
-            "category:*",
-            "categories:*", 
-            "category_tree",
-            "job_search:*"  
-        ]
-        
-        for pattern in cache_patterns:
-            await self.cache.delete(pattern)
+        # Single-category entries, lists and the tree all live in one namespace
+        await self.cache.invalidate(CATEGORIES_NAMESPACE, JOB_SEARCH_NAMESPACE)
 
     def _convert_to_response(self, category: Categories) -> CategoryResponse:
         return CategoryResponse(
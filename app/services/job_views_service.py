@@ -0,0 +1,115 @@
+import asyncio
+import logging
+from collections import defaultdict
+from typing import Dict, Optional
+
+from redis.asyncio import Redis
+from sqlalchemy import update, values, column, Integer
+
+from app.config.setting import settings
+from app.db.database import async_session
+from app.models.jobs_model import Job
+
+
+logger = logging.getLogger(__name__)
+
+PENDING_VIEWS_KEY = 'job_views:pending'
+
+# Read and clear the pending hash atomically so no increment is lost between the two
+_TAKE_PENDING = """
+local data = redis.call('HGETALL', KEYS[1])
+redis.call('DEL', KEYS[1])
+return data
+"""
+
+
+class JobViewBuffer:
+    """Write-behind buffer for job view counts.
+
+    Views are accumulated in a Redis hash (shared by all workers) or, without
+    Redis, in process memory, and flushed periodically with one batched
+    UPDATE ... FROM (VALUES ...) instead of a row update per view.
+    """
+
+    def __init__(self, flush_interval: float = 10.0):
+        self.flush_interval = flush_interval
+        self.redis: Optional[Redis] = None
+        self._take_pending = None
+        self._pending: Dict[int, int] = defaultdict(int)
+        self._task: Optional[asyncio.Task] = None
+
+    async def start(self, redis_client: Optional[Redis] = None):
+        self.redis = redis_client
+        if redis_client is not None:
+            self._take_pending = redis_client.register_script(_TAKE_PENDING)
+        if self._task is None:
+            self._task = asyncio.create_task(self._flush_periodically())
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.flush()
+
+    async def record_view(self, job_id: int):
+        if self.redis is not None:
+            try:
+                await self.redis.hincrby(PENDING_VIEWS_KEY, job_id, 1)
+                return
+            except Exception as e:
+                logger.warning(f'Failed to buffer view in Redis, keeping it in memory: {e}')
+        self._pending[job_id] += 1
+
+    async def flush(self) -> int:
+        """Apply buffered views to job.view_count; returns number of jobs updated"""
+        counts = self._pending
+        self._pending = defaultdict(int)
+
+        if self.redis is not None:
+            try:
+                flat = await self._take_pending(keys=[PENDING_VIEWS_KEY])
+                for job_id, count in zip(flat[::2], flat[1::2]):
+                    counts[int(job_id)] += int(count)
+            except Exception as e:
+                logger.error(f'Failed to read buffered views from Redis: {e}')
+
+        if not counts:
+            return 0
+
+        deltas = values(column('id', Integer), column('delta', Integer), name='view_deltas').data(
+            list(counts.items())
+        )
+        stmt = (
+            update(Job)
+            .where(Job.id == deltas.c.id)
+            .values(view_count=Job.view_count + deltas.c.delta)
+            .execution_options(synchronize_session=False)
+        )
+
+        try:
+            async with async_session() as session:
+                await session.execute(stmt)
+                await session.commit()
+        except Exception as e:
+            logger.error(f'Failed to flush job views, retrying next cycle: {e}')
+            for job_id, count in counts.items():
+                self._pending[job_id] += count
+            return 0
+
+        logger.debug(f'Flushed views for {len(counts)} jobs')
+        return len(counts)
+
+    async def _flush_periodically(self):
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            try:
+                await self.flush()
+            except Exception as e:
+                logger.error(f'Job view flush failed: {e}')
+
+
+job_view_buffer = JobViewBuffer(settings.JOB_VIEW_FLUSH_INTERVAL)
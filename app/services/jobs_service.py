@@ -1,32 +1,106 @@
+import hashlib
+import json
 import logging
-from typing import Optional, Dict, Any, List
+from collections import OrderedDict
+from typing import Optional, Dict, Any, List, Iterable, Tuple
 from contextlib import asynccontextmanager
 from datetime import datetime
 
-from sqlalchemy import select, and_, asc, desc, func
+from sqlalchemy import select, insert, update, delete, and_, asc, desc, func, any_, bindparam, literal_column, tuple_, text, String, Table
+from sqlalchemy.dialects.postgresql import ARRAY, insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError, CompileError
 from sqlalchemy.orm import selectinload, joinedload
 
-from app.config.cache import CacheManager
+from app.config.cache import CacheManager, JOB_SEARCH_NAMESPACE
+from app.db.database import read_session_factory
 from app.services.categories_service import CategoryService
-from app.models.jobs_model import Job, Tag, Skill
+from app.services.job_views_service import job_view_buffer
+from app.models.jobs_model import Job, Tag, Skill, job_skills, job_tags, JOB_SEARCH_CONFIG
 from app.models.company_model import Company
 from app.schemas.job_schema import JobCreate, JobResponse, JobUpdate, JobSearchParams, SkillLevel
+from app.utils.enums import EmploymentType, EducationLevel
 from app.schemas.user_schema import UserResponse
 from app.config.exceptions import PermissionDeniedError, BusinessLogicError, ValidationError, EntityNotFoundError
 from app.utils.slug import generate_unique_slug
+from app.utils.cursor import encode_cursor, decode_cursor
 from app.utils.text_processing import clean_and_validate_skills, clean_and_validate_tags
 
 
 logger = logging.getLogger(__name__)
 
+
+class NameIdCache:
+    """Bounded in-process LRU mapping normalized skill/tag names to ids"""
+
+    def __init__(self, max_size: int = 10000):
+        self.max_size = max_size
+        self._data: OrderedDict[str, int] = OrderedDict()
+
+    def get_many(self, names: Iterable[str]) -> Dict[str, int]:
+        found = {}
+        for name in names:
+            entity_id = self._data.get(name)
+            if entity_id is not None:
+                self._data.move_to_end(name)
+                found[name] = entity_id
+        return found
+
+    def set_many(self, mapping: Dict[str, int]) -> None:
+        for name, entity_id in mapping.items():
+            self._data[name] = entity_id
+            self._data.move_to_end(name)
+        while len(self._data) > self.max_size:
+            self._data.popitem(last=False)
+
+    def discard_many(self, names: Iterable[str]) -> None:
+        for name in names:
+            self._data.pop(name, None)
+
+    def clear(self) -> None:
+        self._data.clear()
+
+
+skill_id_cache = NameIdCache()
+tag_id_cache = NameIdCache()
+
+SEARCH_CONFIG = literal_column(f"'{JOB_SEARCH_CONFIG}'::regconfig")
+
+# Fields that feed Job.search_vector
+SEARCH_VECTOR_FIELDS = {'title', 'description', 'skills_required', 'tags'}
+
+SEARCH_COUNT_CACHE_TTL = 60
+JOB_CACHE_TTL = 3600
+JOB_CACHE_STALE_TTL = 300
+
+# Derived from expires_at at read time, never stored in the cache
+TIME_DERIVED_FIELDS = {'is_expired', 'days_until_expiry', 'hours_until_expiry'}
+
+# Search params that do not change the matched set, excluded from count cache keys
+NON_FILTER_PARAMS = {'sort_by', 'sort_order', 'page', 'page_size', 'pagination', 'cursor', 'count_strategy'}
+
+
+def expiry_fields(expires_at: datetime, current_time: Optional[datetime] = None) -> Dict[str, Any]:
+    """Time-derived JobResponse fields, same rules as Job.is_expired/days_until_expiry"""
+    current_time = current_time or datetime.utcnow()
+    remaining = expires_at - current_time
+    is_expired = current_time > expires_at
+    return {
+        'is_expired': is_expired,
+        'days_until_expiry': 0 if is_expired else remaining.days,
+        'hours_until_expiry': max(0, int(remaining.total_seconds() / 3600)),
+    }
+
+
 class JobService:
 
-    def __init__(self, session: AsyncSession, cache_manager: Optional[CacheManager] = None):
+    def __init__(self, session: AsyncSession, cache_manager: Optional[CacheManager] = None,
+                 read_session: Optional[AsyncSession] = None):
         self.session = session
+        # Replica session for read-only methods (get_job, search_job); defaults to the primary
+        self.read_session = read_session or session
         self.cache = cache_manager
-        self.category_service = CategoryService(session)
+        self.category_service = CategoryService(session, read_session=read_session)
 
     @asynccontextmanager
     async def transaction(self):
@@ -57,9 +131,9 @@ class JobService:
                 
                 await self._validate_user_company_access(current_user)
 
-                skill_objects = await self._process_skills(data.skills_required)
+                skills = clean_and_validate_skills(data.skills_required)
 
-                tag_objects = await self._process_tags(data.tags)
+                tags = clean_and_validate_tags(data.tags)
 
                 slug = await self._generate_job_slug(data.title)
 
@@ -75,24 +149,29 @@ class JobService:
                     category_id = category.id,
                     company_id = current_user.company_id,
                     slug = slug,
-                    skills = skill_objects,
-                    tags = tag_objects,
                     benefits = getattr(data, 'benefits', None),
                     requirements = getattr(data, 'requirements', None)
                 )
 
                 self.session.add(new_job)
+                await self.session.flush()
+
+                await self._link_skills(new_job.id, skills)
+                await self._link_tags(new_job.id, tags)
+                await self._refresh_search_vector(new_job.id)
+
                 await self.session.refresh(
                     new_job, 
                     ['skills', 'tags', 'category', 'company']
                 )
 
-                if self.cache:
-                    await self._invalidate_job_caches(new_job)
+            # After the commit, so concurrent readers cannot re-cache pre-commit data
+            if self.cache:
+                await self._invalidate_job_caches(new_job)
 
-                logger.info(f"Job created successyully: ID {new_job.id}, Title: '{new_job.title}")
+            logger.info(f"Job created successyully: ID {new_job.id}, Title: '{new_job.title}")
 
-                return self._convert_to_response(new_job)
+            return self._convert_to_response(new_job)
             
         except IntegrityError as e:
             logger.error(f'Database integrity error creating job: {str(e)}')
@@ -105,41 +184,58 @@ class JobService:
             raise
 
     async def get_job(self, job_id: int, increment_view: bool =  False) -> JobResponse:
-        cache_key = f'job: {job_id}'
+        if self.cache:
+            # Concurrent misses share one load (per worker, and across workers via the lock);
+            # while it runs, callers are served the stale entry if there is one.
+            job_data = await self.cache.get_or_compute(
+                self._job_cache_key(job_id),
+                lambda: self._load_job_data(job_id),
+                ttl=JOB_CACHE_TTL,
+                stale_ttl=JOB_CACHE_STALE_TTL,
+                use_lock=True
+            )
+            job_response = self._response_from_cache(job_data)
+        else:
+            try:
+                job_response = self._convert_to_response(await self._load_job(job_id))
+            except SQLAlchemyError as e:
+                logger.error(f'Database error fetching job {job_id}: {str(e)}')
+                raise BusinessLogicError('Failed to fetch job')
+
+        if increment_view:
+            # Buffered and applied to view_count in periodic batches, no row lock per view
+            await job_view_buffer.record_view(job_id)
+
+        return job_response
+
+    async def _load_job(self, job_id: int, session: Optional[AsyncSession] = None) -> Job:
+        stmt = select(Job).options(
+            selectinload(Job.skills),
+            selectinload(Job.tags),
+            joinedload(Job.category),
+            joinedload(Job.company)
+        ).where(Job.id == job_id)
+
+        result = await (session or self.read_session).execute(stmt)
+        job = result.scalar_one_or_none()
 
-        if self.cache and not increment_view:
-            cached_job = await self.cache.get(cache_key)
-            if cached_job:
-                logger.debug(f'Job {job_id} returned from cache')
-                return JobResponse.model_validate(cached_job)
-        
-        try:
-            stmt = select(Job).options(
-                selectinload(Job.skills),
-                selectinload(Job.tags),
-                joinedload(Job.category),
-                joinedload(Job.company)
-            ).where(Job.id == job_id)
-
-            result = await self.session.execute(stmt)
-            job = result.scalar_one_or_none()
-
-            if not job:
-                logger.warning(f'Job {job_id} not found')
-                raise EntityNotFoundError(f'Job with ID {job_id} not found')
-            
-            if increment_view:
-                job.increment_view_count()
-                await self.session.commit()
-                logger.debug(f'View count incremented for job {job_id}')
-            
-            job_response = self._convert_to_response(job)
+        if not job:
+            logger.warning(f'Job {job_id} not found')
+            raise EntityNotFoundError(f'Job with ID {job_id} not found')
+        return job
 
-            if self.cache and not increment_view:
-                await self.cache.set(cache_key, job_response.model_dump(), expire=3600)
-            
-            return job_response
-        
+    async def _load_job_data(self, job_id: int) -> Dict[str, Any]:
+        """Cache fill for get_job.
+
+        get_or_compute runs this detached from the request and shares it with
+        other callers, so it opens its own session instead of borrowing the
+        request's, which is closed if the request is cancelled.
+        """
+        factory = await read_session_factory()
+        try:
+            async with factory() as session:
+                job = await self._load_job(job_id, session)
+                return self._convert_to_response(job).model_dump(mode='json', exclude=TIME_DERIVED_FIELDS)
         except SQLAlchemyError as e:
             logger.error(f'Database error fetching job {job_id}: {str(e)}')
             raise BusinessLogicError('Failed to fetch job')
@@ -148,29 +244,34 @@ class JobService:
         logger.info(f"Updating job {job_id} by user {current_user.id}")
 
         try:
-            job = await self._get_job_for_update(job_id, current_user)
-
-            update_data = data.model_dump(exclude_unset=True)
-
-            for field, value in update_data.items():
-                if field == 'skills_required' and value is not None:
-                    job.skills = await self._process_skills(value)
-                elif field == 'tags' and value is not None:
-                    job.tags = await self._process_tags(value)
-                elif field == 'category_id' and value is not None:
-                    category = await self.category_service.get_category(value)
-                    if not category.is_active:
-                        raise ValidationError('Cannot move job to inactive category')
-                    job.category_id = value
-                elif field == "skill_levels" and value is not None:
-                    job.skill_levels = [level.value for level in value]
-                elif hasattr(job, field) and value is not None:
-                    setattr(job, field, value)
-            
-            await self.session.flush()
+            async with self.transaction():
+                job = await self._get_job_for_update(job_id, current_user)
 
-            await self.session.refresh(job, ['skills', 'tags', 'category', 'company'])
+                update_data = data.model_dump(exclude_unset=True)
+
+                for field, value in update_data.items():
+                    if field == 'skills_required' and value is not None:
+                        await self._link_skills(job.id, clean_and_validate_skills(value), replace=True)
+                    elif field == 'tags' and value is not None:
+                        await self._link_tags(job.id, clean_and_validate_tags(value), replace=True)
+                    elif field == 'category_id' and value is not None:
+                        category = await self.category_service.get_category(value)
+                        if not category.is_active:
+                            raise ValidationError('Cannot move job to inactive category')
+                        job.category_id = value
+                    elif field == "skill_levels" and value is not None:
+                        job.skill_levels = [level.value for level in value]
+                    elif hasattr(job, field) and value is not None:
+                        setattr(job, field, value)
+                
+                await self.session.flush()
 
+                if SEARCH_VECTOR_FIELDS & update_data.keys():
+                    await self._refresh_search_vector(job.id)
+
+                await self.session.refresh(job, ['skills', 'tags', 'category', 'company'])
+
+            # After the commit, so concurrent readers cannot re-cache pre-commit data
             if self.cache:
                 await self._invalidate_job_caches(job)
 
@@ -185,14 +286,11 @@ class JobService:
     async def search_job(self, params: JobSearchParams) -> Dict[str, Any]:
         logger.debug(f'Searching jobs with params: {params.model_dump()}')
 
-        try:
-            stmt = select(Job).options(
-                selectinload(Job.skills),
-                selectinload(Job.tags),
-                joinedload(Job.category),
-                joinedload(Job.company)
-            )
+        if params.sort_by == 'relevance' and not params.query:
+            raise ValidationError("sort_by 'relevance' requires a search query")
 
+        try:
+            stmt = select(Job)
             conditions = []
 
             if params.is_active:
@@ -218,12 +316,18 @@ class JobService:
             
             if params.title_search:
                 conditions.append(Job.title.ilike(f"%{params.title_search}%"))
+
+            ts_query = None
+            if params.query:
+                ts_query = func.websearch_to_tsquery(SEARCH_CONFIG, params.query)
+                conditions.append(Job.search_vector.op('@@')(ts_query))
             
+            # EXISTS instead of joins so a job matching several tags/skills is returned once
             if params.tag_search:
-                stmt = stmt.join(Job.tags).where(Tag.normalized_name.ilike(f"%{params.tag_search.lower()}%"))
+                conditions.append(Job.tags.any(Tag.normalized_name.ilike(f"%{params.tag_search.lower()}%")))
             
             if params.skill_search:
-                stmt = stmt.join(Job.skills).where(Skill.normalized_name.ilike(f"%{params.skill_search.lower()}%"))
+                conditions.append(Job.skills.any(Skill.normalized_name.ilike(f"%{params.skill_search.lower()}%")))
             
             if conditions:
                 stmt = stmt.where(and_(*conditions))
@@ -234,28 +338,52 @@ class JobService:
                 order_col = Job.expires_at
             elif params.sort_by == 'title':
                 order_col =Job.title
+            elif params.sort_by == 'relevance':
+                order_col = func.ts_rank_cd(Job.search_vector, ts_query)
             else:
                 order_col = Job.created_at
+
+            filtered_stmt = stmt
+            stmt = stmt.with_only_columns(*self._job_projection(), maintain_column_froms=True)
+
+            if params.pagination == 'cursor':
+                return await self._search_page_by_cursor(stmt, order_col, params)
             
             if params.sort_order == 'asc':
                 stmt = stmt.order_by(asc(order_col))
             else:
                 stmt = stmt.order_by(desc(order_col))
-            
-            count_stmt = select(func.count(Job.id)).where(stmt.whereclause)
-            total_count = await self.session.scalar(count_stmt)
 
             offset = (params.page -1) * params.page_size
             stmt = stmt.offset(offset).limit(params.page_size)
 
-            result = await self.session.execute(stmt)
-            jobs = result.scalars().all()
+            is_estimate = False
+            if params.count_strategy == 'window':
+                result = await self.read_session.execute(stmt.add_columns(func.count().over().label('total_count')))
+                rows = result.all()
+                if rows:
+                    total_count = rows[0].total_count
+                else:
+                    # Past the last page the window has no rows to report on
+                    total_count = await self._count_exact(filtered_stmt) if offset else 0
+            else:
+                if params.count_strategy == 'estimated':
+                    total_count = await self._count_estimated(filtered_stmt, has_filters=filtered_stmt.whereclause is not None)
+                    is_estimate = True
+                elif params.count_strategy == 'cached':
+                    total_count = await self._count_cached(filtered_stmt, params)
+                else:
+                    total_count = await self._count_exact(filtered_stmt)
+
+                result = await self.read_session.execute(stmt)
+                rows = result.all()
 
-            job_responses = [self._convert_to_response(job) for job in jobs]
+            job_responses = [self._row_to_response(row) for row in rows]
 
             return {
                 'jobs': job_responses,
                 'total': total_count,
+                'total_is_estimate': is_estimate,
                 'page': params.page,
                 'page_size': params.page_size,
                 'total_pages': (total_count + params.page_size - 1) // params.page_size,
@@ -266,6 +394,90 @@ class JobService:
             logger.error(f'Database error searching job: {str(e)}')
             raise BusinessLogicError('Job search failed')
         
+    async def _count_exact(self, filtered_stmt) -> int:
+        """Count distinct matching jobs with the same filters as the search"""
+        id_stmt = filtered_stmt.with_only_columns(Job.id, maintain_column_froms=True).order_by(None).distinct()
+        return await self.read_session.scalar(select(func.count()).select_from(id_stmt.subquery())) or 0
+
+    async def _count_estimated(self, filtered_stmt, has_filters: bool) -> int:
+        """Planner row estimate: pg_class.reltuples when unfiltered, EXPLAIN otherwise"""
+        if not has_filters:
+            estimate = await self.read_session.scalar(
+                text("SELECT reltuples::bigint FROM pg_class WHERE oid = 'job'::regclass")
+            )
+            if estimate is not None and estimate >= 0:
+                return int(estimate)
+            return await self._count_exact(filtered_stmt)
+
+        try:
+            connection = await self.read_session.connection()
+            compiled = filtered_stmt.with_only_columns(Job.id, maintain_column_froms=True).compile(
+                dialect=connection.dialect,
+                compile_kwargs={'literal_binds': True, 'render_postcompile': True}
+            )
+        except CompileError as e:
+            logger.debug(f'Cannot render search for EXPLAIN, using exact count: {str(e)}')
+            return await self._count_exact(filtered_stmt)
+
+        # Driver-level execution so literal values are not re-parsed as bind params
+        result = await connection.exec_driver_sql(f'EXPLAIN (FORMAT JSON) {compiled}')
+        plan = result.scalar()
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return int(plan[0]['Plan']['Plan Rows'])
+
+    async def _count_cached(self, filtered_stmt, params: JobSearchParams) -> int:
+        """Exact count memoized per normalized filter set for a short TTL"""
+        if not self.cache:
+            return await self._count_exact(filtered_stmt)
+
+        filters = params.model_dump(mode='json', exclude=NON_FILTER_PARAMS, exclude_none=True)
+        digest = hashlib.sha1(json.dumps(filters, sort_keys=True).encode()).hexdigest()
+        cache_key = f'count:{digest}'
+
+        cached = await self.cache.get(cache_key, namespace=JOB_SEARCH_NAMESPACE)
+        if cached is not None:
+            return cached
+
+        total_count = await self._count_exact(filtered_stmt)
+        await self.cache.set(cache_key, total_count, expire=SEARCH_COUNT_CACHE_TTL, namespace=JOB_SEARCH_NAMESPACE)
+        return total_count
+
+    async def _search_page_by_cursor(self, stmt, order_col, params: JobSearchParams) -> Dict[str, Any]:
+        """Keyset pagination on (sort column, Job.id): cost does not grow with depth and no count is run"""
+        direction = asc if params.sort_order == 'asc' else desc
+
+        if params.cursor:
+            try:
+                last_value, last_id = decode_cursor(params.cursor, params.sort_by, params.sort_order)
+            except ValueError as e:
+                raise ValidationError(str(e))
+
+            position = tuple_(order_col, Job.id)
+            boundary = tuple_(last_value, last_id)
+            stmt = stmt.where(position > boundary if params.sort_order == 'asc' else position < boundary)
+
+        stmt = (
+            stmt.add_columns(order_col.label('sort_value'))
+            .order_by(direction(order_col), direction(Job.id))
+            .limit(params.page_size + 1)
+        )
+
+        result = await self.read_session.execute(stmt)
+        rows = result.all()
+
+        next_cursor = None
+        if len(rows) > params.page_size:
+            rows = rows[:params.page_size]
+            last_row = rows[-1]
+            next_cursor = encode_cursor(params.sort_by, params.sort_order, last_row.sort_value, last_row.id)
+
+        return {
+            'jobs': [self._row_to_response(row) for row in rows],
+            'page_size': params.page_size,
+            'next_cursor': next_cursor
+        }
+
     async def delete_job(self, job_id: int, current_user: UserResponse, hard_delete: bool = False) -> Dict[str, str]:
         logger.info(f'Deletin job {job_id} by user {current_user.id} hard deleted = {hard_delete}')
 
@@ -283,11 +495,12 @@ class JobService:
 
                     message = 'Job deleted successfuly'
 
-                if self.cache:
-                    await self._invalidate_job_caches(job)
-                
-                logger.info(f'Job {job_id} is deleted succesfully')
-                return {'message': message}
+            # After the commit, so concurrent readers cannot re-cache pre-commit data
+            if self.cache:
+                await self._invalidate_job_caches(job)
+            
+            logger.info(f'Job {job_id} is deleted succesfully')
+            return {'message': message}
         except SQLAlchemyError as e:
             logger.error(f"Database error deleting job {job_id}: {str(e)}")
             raise BusinessLogicError("Failed to delete job")
@@ -299,46 +512,132 @@ class JobService:
         if not company.is_active:
             raise BusinessLogicError('Cannot create jobs for inactive company')
         
-    async def _process_skills(self, skills: List[str]) -> List[Skill]:
-        cleaned_skills = clean_and_validate_skills(skills)
-        skill_objects = []
-
-        for skill_name in cleaned_skills:
-            stmt = select(Skill).where(Skill.normalized_name == skill_name.lower())
-            result  = await self.session.execute(stmt)
-            skill_obj = result.scalar_one_or_none()
-
-            if not skill_obj:
-                skill_obj = Skill(name=skill_name)
-                self.session.add(skill_obj)
-                await self.session.flush()
+    async def _link_skills(self, job_id: int, skills: List[str], replace: bool = False) -> None:
+        await self._link_entity_names(Skill, job_skills, 'skill_id', job_id, skills, skill_id_cache, replace)
 
-                logger.debug(f'Create new skill: {skill_name}')
+    async def _link_tags(self, job_id: int, tags: List[str], replace: bool = False) -> None:
+        await self._link_entity_names(Tag, job_tags, 'tag_id', job_id, tags, tag_id_cache, replace)
 
-            skill_objects.append(skill_obj)
-        
-        return skill_objects
-
-    async def _process_tags(self, tags: List[str]) -> List[Tag]:
-        cleaned_tags = clean_and_validate_tags(tags)
-        tags_objects = []
+    async def _link_entity_names(self, model, table: Table, column: str, job_id: int, names: List[str],
+                                 cache: NameIdCache, replace: bool = False) -> None:
+        """Resolve skill/tag names and link them to the job.
 
-        for tag_name in cleaned_tags:
-            stmt = select(Tag).where(Tag.normalized_name == tag_name.lower())
-            result  = await self.session.execute(stmt)
-            tag_obj = result.scalar_one_or_none()
+        Cached ids can point at rows deleted since they were cached. When any
+        were used, the link insert runs in a savepoint; on an IntegrityError
+        those names are evicted, resolved again from the table and linked once more.
+        """
+        entity_ids, cached_names = await self._resolve_entity_ids(model, names, cache)
+        if not cached_names:
+            await self._link_job_entities(table, column, job_id, entity_ids, replace=replace)
+            return
 
-            if not tag_obj:
-                tag_obj = Tag(name=tag_name)
-                self.session.add(tag_obj)
-                await self.session.flush()
+        try:
+            async with self.session.begin_nested():
+                await self._link_job_entities(table, column, job_id, entity_ids, replace=replace)
+        except IntegrityError:
+            logger.warning(f'Stale cached {model.__tablename__} ids for {cached_names}, resolving again')
+            cache.discard_many(cached_names)
+            entity_ids, _ = await self._resolve_entity_ids(model, names, cache)
+            await self._link_job_entities(table, column, job_id, entity_ids, replace=replace)
+
+    async def _resolve_entity_ids(self, model, names: List[str], cache: NameIdCache) -> Tuple[List[int], List[str]]:
+        """Resolve skill/tag names to ids, creating missing rows in one upsert.
+
+        Costs at most one SELECT and one INSERT ... ON CONFLICT DO NOTHING
+        regardless of list size. Only ids seen via SELECT are cached, so rows
+        inserted by a transaction that later rolls back never leak into the cache.
+        Returns the ids and the normalized names that were served from the cache.
+        """
+        by_normalized: Dict[str, str] = {}
+        for name in names:
+            by_normalized.setdefault(name.strip().lower(), name.strip())
+
+        if not by_normalized:
+            return [], []
+
+        resolved = cache.get_many(by_normalized)
+        cached_names = list(resolved)
+        missing = [name for name in by_normalized if name not in resolved]
+
+        if missing:
+            found = await self._select_entity_ids(model, missing)
+            cache.set_many(found)
+            resolved.update(found)
+
+            to_create = [name for name in missing if name not in found]
+            if to_create:
+                stmt = (
+                    pg_insert(model)
+                    .values([
+                        {'name': by_normalized[name], 'normalized_name': name, 'is_active': True}
+                        for name in to_create
+                    ])
+                    .on_conflict_do_nothing()
+                    .returning(model.id, model.normalized_name)
+                )
+                result = await self.session.execute(stmt)
+                created = {normalized: entity_id for entity_id, normalized in result.all()}
+                resolved.update(created)
+                logger.debug(f'Created {len(created)} new {model.__tablename__} rows: {list(created)}')
+
+                # Rows inserted concurrently by another transaction are skipped
+                # by ON CONFLICT and have to be read back.
+                raced = [name for name in to_create if name not in created]
+                if raced:
+                    resolved.update(await self._select_entity_ids(model, raced))
+
+        return [resolved[name] for name in by_normalized if name in resolved], cached_names
+
+    async def _select_entity_ids(self, model, normalized_names: List[str]) -> Dict[str, int]:
+        stmt = select(model.id, model.normalized_name).where(
+            model.normalized_name == any_(bindparam('names', normalized_names, type_=ARRAY(String)))
+        )
+        result = await self.session.execute(stmt)
+        return {normalized: entity_id for entity_id, normalized in result.all()}
+
+    async def _link_job_entities(self, table: Table, column: str, job_id: int,
+                                 entity_ids: List[int], replace: bool = False) -> None:
+        if replace:
+            await self.session.execute(delete(table).where(table.c.job_id == job_id))
+        if entity_ids:
+            await self.session.execute(
+                insert(table).values([{'job_id': job_id, column: entity_id} for entity_id in entity_ids])
+            )
 
-                logger.debug(f'Create new tag: {tag_obj}')
+    async def _refresh_search_vector(self, job_id: int) -> None:
+        """Rebuild the weighted full-text document of a job in one UPDATE"""
+        await self.session.execute(
+            update(Job)
+            .where(Job.id == job_id)
+            .values(search_vector=self.search_document())
+            .execution_options(synchronize_session=False)
+        )
+
+    @staticmethod
+    def search_document():
+        """Job.search_vector expression for the job row being updated"""
+        skills_text = (
+            select(func.string_agg(Skill.name, ' '))
+            .select_from(job_skills.join(Skill, Skill.id == job_skills.c.skill_id))
+            .where(job_skills.c.job_id == Job.id)
+            .scalar_subquery()
+        )
+        tags_text = (
+            select(func.string_agg(Tag.name, ' '))
+            .select_from(job_tags.join(Tag, Tag.id == job_tags.c.tag_id))
+            .where(job_tags.c.job_id == Job.id)
+            .scalar_subquery()
+        )
+        return (
+            func.setweight(func.to_tsvector(SEARCH_CONFIG, func.coalesce(Job.title, '')), literal_column("'A'"))
+            .op('||')(func.setweight(
+                func.to_tsvector(SEARCH_CONFIG, func.concat_ws(' ', skills_text, tags_text)), literal_column("'B'")
+            ))
+            .op('||')(func.setweight(
+                func.to_tsvector(SEARCH_CONFIG, func.coalesce(Job.description, '')), literal_column("'C'")
+            ))
+        )
 
-            tags_objects.append(tag_obj)
-        
-        return tags_objects
-    
     async def _get_job_for_update(self, job_id: int, user: UserResponse) -> Job:
         stmt = select(Job).where(Job.id == job_id)
         result = await self.session.execute(stmt)
@@ -360,18 +659,86 @@ class JobService:
         if not self.cache:
             return 
         
-        cache_keys = [
-            f"Job: {job.id}",
-            f"company_jobs: {job.company_id}",
-            f"category_jos: {job.category_id}",
-            "job_search:*"
-        ]
+        await self.cache.delete(self._job_cache_key(job.id))
+        await self.cache.invalidate(JOB_SEARCH_NAMESPACE)
 
-        for key in cache_keys:
-            await self.cache.delete(key)
+    @staticmethod
+    def _job_cache_key(job_id: int) -> str:
+        return f'job:{job_id}'
     
+    @staticmethod
+    def _job_projection() -> list:
+        """Columns JobResponse needs, with skill/tag names aggregated in the same query"""
+        skill_names = (
+            select(func.array_agg(Skill.name))
+            .select_from(job_skills.join(Skill, Skill.id == job_skills.c.skill_id))
+            .where(job_skills.c.job_id == Job.id)
+            .scalar_subquery()
+        )
+        tag_names = (
+            select(func.array_agg(Tag.name))
+            .select_from(job_tags.join(Tag, Tag.id == job_tags.c.tag_id))
+            .where(job_tags.c.job_id == Job.id)
+            .scalar_subquery()
+        )
+        return [
+            Job.id, Job.title, Job.description, Job.salary, Job.location,
+            Job.employment_type, Job.education_level, Job.skill_levels, Job.expires_at,
+            Job.company_id, Job.category_id, Job.is_active, Job.created_at, Job.updated_at,
+            skill_names.label('skill_names'), tag_names.label('tag_names'),
+        ]
+
+    def _row_to_response(self, row) -> JobResponse:
+        """Build JobResponse from a _job_projection row without materializing ORM objects.
+
+        Rows come from the database and are not re-validated: validate_expires_at
+        is a create-time rule and would reject expired jobs (include_expired).
+        """
+        return JobResponse.model_construct(
+            id=row.id,
+            title=row.title,
+            description=row.description,
+            salary=row.salary,
+            location=row.location,
+            employment_type=row.employment_type,
+            education_level=row.education_level,
+            skill_levels=[SkillLevel(level) for level in row.skill_levels],
+            skills_required=row.skill_names or [],
+            tags=row.tag_names or [],
+            expires_at=row.expires_at,
+            company_id=row.company_id,
+            category_id=row.category_id,
+            is_active=row.is_active,
+            created_at=row.created_at,
+            updated_at=row.updated_at,
+            **expiry_fields(row.expires_at)
+        )
+
+    @staticmethod
+    def _response_from_cache(data: Dict[str, Any]) -> JobResponse:
+        """Trusted rebuild of a cached JobResponse.
+
+        The payload was produced by _convert_to_response, so validators are
+        skipped: re-running validate_expires_at would reject jobs that expired
+        after caching. Only JSON-degraded types are restored and the expiry
+        fields are recomputed for the current time.
+        """
+        fields = dict(data)
+        expires_at = datetime.fromisoformat(data['expires_at'])
+        fields.update(
+            employment_type=EmploymentType(data['employment_type']),
+            education_level=EducationLevel(data['education_level']) if data.get('education_level') else None,
+            skill_levels=[SkillLevel(level) for level in data['skill_levels']],
+            expires_at=expires_at,
+            created_at=datetime.fromisoformat(data['created_at']),
+            updated_at=datetime.fromisoformat(data['updated_at']),
+            **expiry_fields(expires_at)
+        )
+        return JobResponse.model_construct(**fields)
+
     def _convert_to_response(self, job: Job) -> JobResponse:
-        return JobResponse(
+        """Build JobResponse from a loaded Job; stored rows are not re-validated, as in _response_from_cache"""
+        return JobResponse.model_construct(
             id=job.id,
             title=job.title,
             description=job.description,
@@ -388,8 +755,6 @@ class JobService:
             is_active=job.is_active,
             created_at=job.created_at,
             updated_at=job.updated_at,
-            is_expired=job.is_expired(),
-            days_until_expiry=job.days_until_expiry(),
-            hours_until_expiry=max(0, int((job.expires_at - datetime.utcnow()).total_seconds() / 3600))
+            **expiry_fields(job.expires_at)
 
         )
\ No newline at end of file
@@ -0,0 +1,125 @@
+import asyncio
+import logging
+from collections import deque
+from datetime import datetime
+from typing import Deque, Optional, Tuple
+
+from sqlalchemy import insert
+from sqlalchemy.exc import IntegrityError
+
+from app.config.setting import settings
+from app.db.database import async_session
+from app.models.prod_models import PerformanceMetric
+
+
+logger = logging.getLogger(__name__)
+
+# (endpoint, method, status_code, response_time, user_id, ip_address, recorded_at)
+Sample = Tuple[str, str, int, float, Optional[int], Optional[str], datetime]
+
+ENDPOINT_MAX_LENGTH = 100
+
+
+class MetricsCollector:
+    """Ring buffer of request samples flushed to PerformanceMetric in batches.
+
+    record() is a deque append and never touches the database. When the
+    flusher falls behind, the buffer overwrites its oldest samples and the
+    loss is counted in `dropped` rather than slowing requests down.
+    """
+
+    def __init__(self, max_samples: int = 10000, flush_interval: float = 5.0, batch_size: int = 1000):
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self._buffer: Deque[Sample] = deque(maxlen=max_samples)
+        self._task: Optional[asyncio.Task] = None
+        self.recorded = 0
+        self.dropped = 0
+
+    def record(self, endpoint: str, method: str, status_code: int, response_time: float,
+               user_id: Optional[int] = None, ip_address: Optional[str] = None):
+        if len(self._buffer) == self._buffer.maxlen:
+            self.dropped += 1
+        self._buffer.append((
+            endpoint[:ENDPOINT_MAX_LENGTH], method, status_code, response_time,
+            user_id, ip_address, datetime.utcnow()
+        ))
+        self.recorded += 1
+
+    async def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._flush_periodically())
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.flush()
+
+    async def flush(self) -> int:
+        """Write buffered samples in multi-row INSERTs; returns number written"""
+        written = 0
+        while self._buffer:
+            batch = [self._buffer.popleft() for _ in range(min(self.batch_size, len(self._buffer)))]
+            rows = [
+                {
+                    'endpoint': endpoint,
+                    'method': method,
+                    'status_code': status_code,
+                    'response_time': response_time,
+                    'user_id': user_id,
+                    'ip_address': ip_address,
+                    'created_at': recorded_at,
+                    'updated_at': recorded_at
+                }
+                for endpoint, method, status_code, response_time, user_id, ip_address, recorded_at in batch
+            ]
+
+            try:
+                try:
+                    await self._insert(rows)
+                except IntegrityError as e:
+                    # user_id comes from the token; a user deleted since fails the FK for the whole batch
+                    logger.warning(f'Retrying {len(rows)} performance metrics without user ids: {e}')
+                    await self._insert([{**row, 'user_id': None} for row in rows])
+            except Exception as e:
+                # Metrics are best effort: never re-queue and grow the backlog
+                self.dropped += len(batch)
+                logger.error(f'Failed to flush {len(batch)} performance metrics: {e}')
+                break
+
+            written += len(batch)
+
+        return written
+
+    @staticmethod
+    async def _insert(rows: list):
+        async with async_session() as session:
+            await session.execute(insert(PerformanceMetric), rows)
+            await session.commit()
+
+    def get_stats(self) -> dict:
+        return {
+            'buffered': len(self._buffer),
+            'recorded': self.recorded,
+            'dropped': self.dropped
+        }
+
+    async def _flush_periodically(self):
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            try:
+                await self.flush()
+            except Exception as e:
+                logger.error(f'Performance metrics flush failed: {e}')
+
+
+metrics_collector = MetricsCollector(
+    max_samples=settings.METRICS_BUFFER_SIZE,
+    flush_interval=settings.METRICS_FLUSH_INTERVAL,
+    batch_size=settings.METRICS_BATCH_SIZE
+)
@@ -9,6 +9,7 @@ from app.utils.enums import UserRole
 from app.models.users_model import User
 from app.models.resumes_model import Resume
 from app.schemas.resume_schema import ResumeCreate, ResumeUpdate
+from app.schemas.user_schema import UserPrincipal
 
 import logging
 
@@ -89,7 +90,7 @@ class ResumeService:
         await db.commit()
         return {'messgae': 'Default resume set succesfully'}
     
-    async def get_my_resumes_service(self, db: AsyncSession, current_user: User):
+    async def get_my_resumes_service(self, db: AsyncSession, current_user: UserPrincipal):
         stmt = await db.execute(select(Resume).where(and_(Resume.user_id == current_user.id, Resume.is_deleted == False)))
         resumes = stmt.scalars().all()
         return resumes
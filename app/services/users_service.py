@@ -19,6 +19,9 @@ from app.config.user_exceptions import (
     InvalidTokenError
 )
 from app.auth.hash import hash_password, verify_password
+from app.auth.principal import principal_cache
+from app.auth.revocation import token_revocations
+from app.auth.refresh_tokens import refresh_tokens
 from app.utils.email import email_service
 from app.utils.tokens import (
     generate_verification_token, generate_password_reset_token
@@ -64,7 +67,7 @@ class UserService:
                 role=user_data.role,
                 email_verification_token=generate_verification_token(),
             )
-            user.set_password(user_data.password)
+            await user.set_password(user_data.password)
 
             db.add(user)
             await db.commit()
@@ -111,10 +114,12 @@ class UserService:
                     detail="Account is deactivated"
                 )
 
-            if not user.verify_password(password):
+            if not await user.verify_password(password):
                 user.increment_failed_login(ip_address)
                 if user.login_attempts >= 5:
                     user.lock_account(30)
+                    # Only blocks new logins; existing sessions stay, or anyone knowing
+                    # the email could sign the owner out by failing five times
                     await db.commit()
                     raise AccountLockedError("Account locked due to multiple failed login attempts")
                 await db.commit()
@@ -169,6 +174,7 @@ class UserService:
         user.email_verification_token = None
         db.add(user)
         await db.commit()
+        await principal_cache.invalidate(user.id)
 
     async def resend_verification_email(self, db: AsyncSession, email: str):
         user = await self.get_user_by_email(db, email)
@@ -216,13 +222,15 @@ class UserService:
         if  user.password_reset_expires < datetime.utcnow():
             raise InvalidTokenError('Token has expired')
         
-        user.set_password(new_password)
+        await user.set_password(new_password)
 
         user.password_reset_expires = None
         user.password_reset_token = None
 
         db.add(user)
         await db.commit()
+        # Sessions started before the reset may belong to whoever knew the old password
+        await self._revoke_sessions(user.id)
 
     async def delete_user_service(self, db: AsyncSession, user: User):
         if user.is_active == False:
@@ -231,13 +239,23 @@ class UserService:
         user.is_active = False
         db.add(user)
         await db.commit()
+        await self._revoke_sessions(user.id)
     
-    async def change_password_service(self, data: ChangePasswordRequest, db: AsyncSession, user: User):
-        if not user.verify_password(data.current_password):
+    async def change_password_service(self, data: ChangePasswordRequest, db: AsyncSession, user: User,
+                                      keep_family: Optional[str] = None):
+        """Change the password and sign out every other session (keep_family is the caller's)"""
+        if not await user.verify_password(data.current_password):
             raise InvalidCredentialsError('Old password incorrect')
         
-        user.set_password(data.new_password)
+        await user.set_password(data.new_password)
         db.add(user)
         await db.commit()
+        await self._revoke_sessions(user.id, keep_family)
+
+    async def _revoke_sessions(self, user_id: int, keep_family: Optional[str] = None):
+        """Revoke access and refresh tokens of user_id, except those of the keep_family session"""
+        await principal_cache.invalidate(user_id)
+        await token_revocations.revoke_user(user_id, keep_family)
+        await refresh_tokens.revoke_user(user_id, keep_family)
 
 user_service = UserService()
@@ -0,0 +1,53 @@
+import base64
+import binascii
+import json
+import math
+from datetime import datetime
+from typing import Any, Tuple
+
+# Python type of the keyset value for each sort_by
+SORT_VALUE_TYPES = {
+    'created_at': datetime,
+    'expires_at': datetime,
+    'salary': float,
+    'relevance': float,
+    'title': str,
+}
+
+
+def encode_cursor(sort_by: str, sort_order: str, value: Any, last_id: int) -> str:
+    """Encode keyset position (sort value + job id) into an opaque cursor"""
+    payload = {'s': sort_by, 'o': sort_order, 'id': last_id}
+    if isinstance(value, datetime):
+        payload['dt'] = value.isoformat()
+    else:
+        payload['v'] = value
+
+    raw = json.dumps(payload, separators=(',', ':')).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def decode_cursor(cursor: str, sort_by: str, sort_order: str) -> Tuple[Any, int]:
+    """Decode cursor into (sort value, job id); raise ValueError if it does not fit the sort"""
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        last_id = int(payload['id'])
+        value = datetime.fromisoformat(payload['dt']) if 'dt' in payload else payload['v']
+    except (binascii.Error, ValueError, KeyError, TypeError) as e:
+        raise ValueError('Malformed pagination cursor') from e
+
+    if payload.get('s') != sort_by or payload.get('o') != sort_order:
+        raise ValueError('Pagination cursor does not match the requested sorting')
+
+    if not _value_fits(value, SORT_VALUE_TYPES.get(sort_by)):
+        raise ValueError('Malformed pagination cursor')
+
+    return value, last_id
+
+
+def _value_fits(value: Any, expected: type) -> bool:
+    if expected is float:
+        # bool is an int subclass; NaN/inf have no place in a keyset
+        return isinstance(value, (int, float)) and not isinstance(value, bool) and math.isfinite(value)
+    return expected is not None and isinstance(value, expected)
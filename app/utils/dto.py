@@ -1,4 +1,4 @@
-from app.schemas.user_schema import UserResponse, UserProfile
+from app.schemas.user_schema import UserResponse, UserProfile, UserPrincipal
 
 def map_user_to_response(user: "User") -> UserResponse:
     """Преобразуем SQLAlchemy User в Pydantic UserResponse"""
@@ -16,6 +16,17 @@ def map_user_to_response(user: "User") -> UserResponse:
         updated_at=user.updated_at
     )
 
+def map_user_to_principal(user: "User") -> UserPrincipal:
+    """Поля авторизации пользователя для кэша"""
+    return UserPrincipal(
+        id=user.id,
+        role=user.role,
+        is_active=user.is_active,
+        is_admin=user.is_admin,
+        email_verified=user.email_verified,
+        company_id=user.get_company_id()
+    )
+
 def map_user_to_profile(user: "User") -> UserProfile:
     """Преобразуем SQLAlchemy User в Pydantic UserProfile"""
     company_name = None
@@ -1,20 +1,131 @@
+import asyncio
+import queue
 import smtplib
 import secrets
+import time
+from concurrent.futures import ThreadPoolExecutor
+from email.message import Message
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
-from typing import Optional
+from typing import Optional, Tuple
 from datetime import datetime, timedelta
 import logging
 from app.config.setting import settings
 
 logger = logging.getLogger(__name__)
 
+
+class SMTPConnectionPool:
+    """Authenticated SMTP sessions reused across messages.
+
+    Used from executor threads only: connect, STARTTLS, login and sending
+    all block. Sessions idle longer than idle_timeout are replaced, since
+    servers drop them on their own.
+    """
+
+    def __init__(self, server: str, port: int, username: str, password: str,
+                 size: int = 4, timeout: float = 30.0, idle_timeout: float = 60.0):
+        self.server = server
+        self.port = port
+        self.username = username
+        self.password = password
+        self.timeout = timeout
+        self.idle_timeout = idle_timeout
+        self._idle: queue.LifoQueue[Tuple[smtplib.SMTP, float]] = queue.LifoQueue(maxsize=size)
+
+    def _connect(self) -> smtplib.SMTP:
+        connection = smtplib.SMTP(self.server, self.port, timeout=self.timeout)
+        try:
+            connection.starttls()
+            connection.login(self.username, self.password)
+        except Exception:
+            self._discard(connection)
+            raise
+        return connection
+
+    def _acquire(self) -> smtplib.SMTP:
+        while True:
+            try:
+                connection, last_used = self._idle.get_nowait()
+            except queue.Empty:
+                return self._connect()
+            if time.monotonic() - last_used < self.idle_timeout:
+                return connection
+            self._discard(connection)
+
+    def _release(self, connection: smtplib.SMTP):
+        try:
+            self._idle.put_nowait((connection, time.monotonic()))
+        except queue.Full:
+            self._discard(connection)
+
+    @staticmethod
+    def _discard(connection: smtplib.SMTP):
+        try:
+            connection.quit()
+        except Exception:
+            connection.close()
+
+    def send(self, message: Message):
+        connection = self._acquire()
+        try:
+            connection.send_message(message)
+        except smtplib.SMTPServerDisconnected:
+            # Server closed the pooled session; retry once on a fresh one
+            connection.close()
+            connection = self._connect()
+            try:
+                connection.send_message(message)
+            except Exception:
+                self._discard(connection)
+                raise
+        except Exception:
+            self._discard(connection)
+            raise
+        self._release(connection)
+
+    def close(self):
+        while True:
+            try:
+                connection, _ = self._idle.get_nowait()
+            except queue.Empty:
+                return
+            self._discard(connection)
+
+
 class EmailService:
     def __init__(self):
         self.smtp_server = settings.SMTP_SERVER
         self.smtp_port = settings.SMTP_PORT
         self.username = settings.SMTP_USERNAME
         self.password = settings.SMTP_PASSWORD
+        self._pool: Optional[SMTPConnectionPool] = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    def _get_sender(self) -> Tuple[SMTPConnectionPool, ThreadPoolExecutor]:
+        if self._pool is None:
+            self._pool = SMTPConnectionPool(
+                self.smtp_server,
+                self.smtp_port,
+                self.username,
+                self.password,
+                size=settings.SMTP_POOL_SIZE,
+                timeout=settings.SMTP_TIMEOUT,
+                idle_timeout=settings.SMTP_IDLE_TIMEOUT
+            )
+            # One worker per pooled session so no thread waits on another's connection
+            self._executor = ThreadPoolExecutor(max_workers=settings.SMTP_POOL_SIZE, thread_name_prefix='smtp')
+        return self._pool, self._executor
+
+    async def close(self):
+        """Close pooled SMTP sessions and stop sender threads"""
+        executor, pool = self._executor, self._pool
+        self._executor = self._pool = None
+        # Waiting for queued sends and QUIT both block, keep them off the event loop
+        if executor:
+            await asyncio.to_thread(executor.shutdown, wait=True)
+        if pool:
+            await asyncio.to_thread(pool.close)
 
     async def send_email(self, to_email: str, subject: str, body: str, is_html: bool = False) -> bool:
         """Send email via SMTP"""
@@ -30,10 +141,9 @@ class EmailService:
 
             message.attach(MIMEText(body, 'html' if is_html else 'plain'))
 
-            with smtplib.SMTP(self.smtp_server, self.smtp_port) as server:
-                server.starttls()
-                server.login(self.username, self.password)
-                server.send_message(message)
+            # SMTP I/O runs on sender threads over pooled sessions, never on the event loop
+            pool, executor = self._get_sender()
+            await asyncio.get_running_loop().run_in_executor(executor, pool.send, message)
             
             logger.info(f"Email sent successfully to {to_email}")
             return True
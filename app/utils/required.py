@@ -1,19 +1,19 @@
 from fastapi import Depends, HTTPException, status
-from app.schemas.user_schema import UserResponse
-from app.auth.deps import get_current_user
+from app.schemas.user_schema import UserPrincipal
+from app.auth.deps import get_current_principal
 
-async def admin_required(current_user: UserResponse = Depends(get_current_user)):
+async def admin_required(current_user: UserPrincipal = Depends(get_current_principal)):
     if not current_user.is_admin:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail='Admin access required')
     return current_user
     
 
-async def candidate_required(current_user: UserResponse = Depends(get_current_user)) -> UserResponse:
+async def candidate_required(current_user: UserPrincipal = Depends(get_current_principal)) -> UserPrincipal:
     if current_user.role != 'candidate':
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail='Candidate access required')
     return current_user
 
-async def employer_required(current_user: UserResponse = Depends(get_current_user)) -> UserResponse:
+async def employer_required(current_user: UserPrincipal = Depends(get_current_principal)) -> UserPrincipal:
     if current_user.role != 'employer':
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail='Employer access required')
     return current_user
\ No newline at end of file
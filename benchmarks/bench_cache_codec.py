@@ -0,0 +1,86 @@
+"""Encode/decode cost and payload size of each CacheCodec configuration.
+
+Payloads mirror what the services cache: a page of 20 JobResponse dicts
+(model_dump(mode='json')) and a category tree of 200 nodes. The baseline
+row is what CacheManager did before the codec, json.dumps/json.loads.
+Serializers or compressors that are not installed are skipped.
+"""
+import json
+from datetime import datetime, timedelta
+
+from benchmarks.common import measure, print_table
+from app.config import cache_codec
+from app.config.cache_codec import CacheCodec
+
+CONFIGURATIONS = [
+    ('json', None), ('orjson', None), ('msgpack', None),
+    ('orjson', 'zlib'), ('orjson', 'zstd'), ('orjson', 'lz4'), ('msgpack', 'zstd'),
+]
+AVAILABLE = {
+    'orjson': cache_codec.orjson is not None, 'msgpack': cache_codec.msgpack is not None,
+    'zstd': cache_codec.zstandard is not None, 'lz4': cache_codec.lz4_frame is not None,
+}
+
+
+def job_page(size: int = 20) -> dict:
+    now = datetime(2025, 1, 1)
+    jobs = [{
+        'id': job_id,
+        'title': f'Senior Python Developer #{job_id}',
+        'description': 'Build and operate the hiring platform APIs. ' * 12,
+        'salary': 4500.0 + job_id,
+        'location': 'Baku, Azerbaijan',
+        'employment_type': 'full_time',
+        'education_level': 'bachelor',
+        'skill_levels': ['senior'],
+        'skills_required': ['Python', 'FastAPI', 'PostgreSQL', 'Redis', 'Docker'],
+        'tags': ['backend', 'remote-friendly', 'api'],
+        'expires_at': (now + timedelta(days=30)).isoformat(),
+        'company_id': 7,
+        'category_id': 3,
+        'is_active': True,
+        'created_at': now.isoformat(),
+        'updated_at': now.isoformat(),
+    } for job_id in range(size)]
+    return {'jobs': jobs, 'total': 1240, 'page': 1, 'page_size': size, 'total_pages': 62}
+
+
+def category_tree(roots: int = 20, children: int = 9) -> list:
+    def node(node_id: int, parent_id, nested: list) -> dict:
+        return {
+            'id': node_id, 'name': f'Category {node_id}', 'description': 'Jobs in this area of work',
+            'is_active': True, 'parent_id': parent_id, 'active_jobs_count': node_id * 3,
+            'created_at': '2025-01-01T00:00:00', 'updated_at': '2025-01-01T00:00:00', 'children': nested,
+        }
+    tree = []
+    for root in range(roots):
+        root_id = root * (children + 1)
+        tree.append(node(root_id, None, [node(root_id + child, root_id, []) for child in range(1, children + 1)]))
+    return tree
+
+
+def main():
+    payloads = {'job page (20)': job_page(), 'category tree (200)': category_tree()}
+    for name, value in payloads.items():
+        baseline = json.dumps(value).encode()
+        rows = [[
+            'json.dumps (before)', len(baseline),
+            f'{measure(lambda: json.dumps(value)) * 1e6:.1f}',
+            f'{measure(lambda: json.loads(baseline)) * 1e6:.1f}',
+        ]]
+        for serializer, compression in CONFIGURATIONS:
+            if not AVAILABLE.get(serializer, True) or not AVAILABLE.get(compression, True):
+                continue
+            codec = CacheCodec(serializer, compression, compression_threshold=1024)
+            encoded = codec.encode(value)
+            rows.append([
+                f'{serializer}+{compression or "none"}', len(encoded),
+                f'{measure(lambda: codec.encode(value)) * 1e6:.1f}',
+                f'{measure(lambda: codec.decode(encoded)) * 1e6:.1f}',
+            ])
+        print(f'\n{name}')
+        print_table(['codec', 'bytes', 'encode us', 'decode us'], rows)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,86 @@
+"""Cost of one search result page: ORM entities vs a column projection.
+
+Both paths run the default search (active, unexpired, newest first) and
+build JobResponse objects. The ORM path is what search_job did before:
+full Job entities with selectinload(skills, tags) and joinedload(category,
+company), converted by _convert_to_response. The projection path is the
+current one: _job_projection() columns with skill and tag names
+aggregated in the same statement, converted by _row_to_response. Each
+call opens a new session, so the identity map never serves a page from
+an earlier call.
+
+Needs PostgreSQL; see benchmarks.job_data.
+"""
+import asyncio
+from datetime import datetime
+
+from sqlalchemy import select
+from sqlalchemy.orm import joinedload, selectinload
+
+from benchmarks.common import measure_async, print_table
+from benchmarks import job_data
+from app.models.jobs_model import Job
+from app.services.jobs_service import TIME_DERIVED_FIELDS, JobService
+
+PAGE_SIZES = [20, 100]
+NUMBER = 50
+
+
+def _filtered(stmt, page_size: int):
+    return (
+        stmt.where(Job.is_active == True, Job.expires_at >= datetime.utcnow())
+        .order_by(Job.created_at.desc())
+        .limit(page_size)
+    )
+
+
+def _comparable(job) -> dict:
+    """JobResponse fields both paths must agree on; name order is not defined by either query"""
+    data = job.model_dump(exclude=TIME_DERIVED_FIELDS)
+    data.update(skills_required=sorted(data['skills_required']), tags=sorted(data['tags']))
+    return data
+
+
+async def main():
+    engine = job_data.create_engine()
+    await job_data.seed(engine, job_data.job_count())
+    sessions = job_data.session_factory(engine)
+
+    async def orm_page(page_size: int):
+        async with sessions() as session:
+            stmt = _filtered(select(Job), page_size).options(
+                selectinload(Job.skills),
+                selectinload(Job.tags),
+                joinedload(Job.category),
+                joinedload(Job.company)
+            )
+            service = JobService(session)
+            jobs = (await session.execute(stmt)).scalars().all()
+            return [service._convert_to_response(job) for job in jobs]
+
+    async def projection_page(page_size: int):
+        async with sessions() as session:
+            stmt = _filtered(select(*JobService._job_projection()), page_size)
+            service = JobService(session)
+            rows = (await session.execute(stmt)).all()
+            return [service._row_to_response(row) for row in rows]
+
+    rows = []
+    for page_size in PAGE_SIZES:
+        orm = await orm_page(page_size)
+        projected = await projection_page(page_size)
+        assert [_comparable(job) for job in orm] == [_comparable(job) for job in projected]
+
+        orm_seconds = await measure_async(lambda: orm_page(page_size), number=NUMBER)
+        projection_seconds = await measure_async(lambda: projection_page(page_size), number=NUMBER)
+        rows.append([
+            page_size, f'{orm_seconds * 1e3:.2f}', f'{projection_seconds * 1e3:.2f}',
+            f'{orm_seconds / projection_seconds:.1f}x',
+        ])
+
+    print_table(['page size', 'ORM + selectinload ms (before)', 'projection ms', 'speedup'], rows)
+    await engine.dispose()
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
@@ -0,0 +1,62 @@
+"""Job search latency: the ilike filters vs tsvector full-text search.
+
+Each row runs JobService.search_job for one search term twice: with the
+ilike filter the API offered before (title_search / skill_search) and with
+`query` ranked by relevance over the GIN-indexed search_vector. Both are
+timed for the default offset page with an exact total and for a cursor
+page, which skips the count. The full-text query also matches skills,
+tags and description words, so the matched counts differ; they are shown.
+
+Needs PostgreSQL; see benchmarks.job_data. BENCH_JOBS sets the table size
+(default 1,000,000, seeded once).
+"""
+import asyncio
+
+from benchmarks.common import measure_async, print_table
+from benchmarks import job_data
+from app.schemas.job_schema import JobSearchParams
+from app.services.jobs_service import JobService
+
+# (label, ilike params, full-text query)
+SEARCHES = [
+    ('title "kotlin"', {'title_search': 'kotlin'}, 'kotlin'),
+    ('title "senior python"', {'title_search': 'senior python'}, 'senior python'),
+    ('skill "docker"', {'skill_search': 'docker'}, 'docker'),
+    ('no match', {'title_search': 'cobol'}, 'cobol'),
+]
+NUMBER = 5
+
+
+async def main():
+    engine = job_data.create_engine()
+    await job_data.seed(engine, job_data.job_count())
+    sessions = job_data.session_factory(engine)
+
+    async def search(**params):
+        async with sessions() as session:
+            return await JobService(session).search_job(JobSearchParams(**params))
+
+    rows = []
+    for label, ilike, query in SEARCHES:
+        fulltext = {'query': query, 'sort_by': 'relevance'}
+        ilike_total = (await search(**ilike))['total']
+        fulltext_total = (await search(**fulltext))['total']
+        timings = []
+        for params in (ilike, fulltext):
+            timings.append(await measure_async(lambda: search(**params), number=NUMBER))
+            timings.append(await measure_async(lambda: search(**params, pagination='cursor'), number=NUMBER))
+        rows.append([
+            label, ilike_total, fulltext_total,
+            *(f'{seconds * 1e3:.1f}' for seconds in timings),
+        ])
+
+    print_table(
+        ['search', 'ilike matches', 'fts matches', 'ilike offset ms', 'ilike cursor ms',
+         'fts offset ms', 'fts cursor ms'],
+        rows
+    )
+    await engine.dispose()
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
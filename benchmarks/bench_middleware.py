@@ -0,0 +1,106 @@
+"""Requests/sec through the rate limit + timing middleware stack.
+
+The same FastAPI app is served with the pure ASGI RateLimitMiddleware and
+TimingMiddleware (current), and with the BaseHTTPMiddleware wrapping that
+@app.middleware("http") used before, doing the same rate limit check and
+X-Process-Time header. Requests are driven straight into the ASGI app,
+so the numbers cover the server side only, without sockets or a client.
+/auth/me verifies a bearer token but does not load the user from the DB.
+The pure ASGI stack also records metrics and query stats, which the old
+one did not, so its gain is understated, not inflated.
+"""
+import asyncio
+import os
+import time
+
+from benchmarks.common import print_table
+
+os.environ.setdefault('METRICS_ENABLED', 'false')
+
+from fastapi import Depends, FastAPI, Request
+from fastapi.responses import JSONResponse
+from fastapi.security import OAuth2PasswordBearer
+
+from app.auth.jwt import create_access_token, decode_access_claims
+from app.config import middleware
+from app.config.middleware import RateLimitMiddleware, TimingMiddleware, rate_limiter
+
+REQUESTS = 5000
+oauth2_scheme = OAuth2PasswordBearer(tokenUrl='/auth/login')
+
+
+def build_app(pure_asgi: bool) -> FastAPI:
+    app = FastAPI()
+
+    @app.get('/health')
+    async def health():
+        return {'status': 'healthy', 'timestamp': time.time()}
+
+    @app.get('/auth/me')
+    async def me(token: str = Depends(oauth2_scheme)):
+        return {'id': int(decode_access_claims(token)['sub'])}
+
+    if pure_asgi:
+        app.add_middleware(RateLimitMiddleware)
+        app.add_middleware(TimingMiddleware)
+        return app
+
+    @app.middleware('http')
+    async def rate_limiting_middleware(request: Request, call_next):
+        allowed, _ = await rate_limiter.hit(middleware._client_identity(request.scope), request.url.path)
+        if not allowed:
+            return JSONResponse(status_code=429, content={'detail': 'Too many requests'})
+        return await call_next(request)
+
+    @app.middleware('http')
+    async def timing_middleware(request: Request, call_next):
+        start_time = time.perf_counter()
+        response = await call_next(request)
+        response.headers['X-Process-Time'] = str(time.perf_counter() - start_time)
+        return response
+
+    return app
+
+
+async def run(app: FastAPI, path: str, headers: list) -> float:
+    scope = {
+        'type': 'http', 'asgi': {'version': '3.0'}, 'http_version': '1.1', 'method': 'GET',
+        'scheme': 'http', 'path': path, 'raw_path': path.encode(), 'query_string': b'',
+        'root_path': '', 'headers': headers, 'client': ('127.0.0.1', 50000), 'server': ('bench', 80),
+    }
+    statuses = []
+
+    async def receive():
+        return {'type': 'http.request', 'body': b'', 'more_body': False}
+
+    async def send(message):
+        if message['type'] == 'http.response.start':
+            statuses.append(message['status'])
+
+    for _ in range(200):
+        await app(dict(scope), receive, send)
+    start = time.perf_counter()
+    for _ in range(REQUESTS):
+        await app(dict(scope), receive, send)
+    elapsed = time.perf_counter() - start
+    assert set(statuses) == {200}, f'unexpected statuses {set(statuses)}'
+    return REQUESTS / elapsed
+
+
+async def main():
+    # Measure the middleware, not 429s
+    rate_limiter.default_limit = 10 ** 9
+    rate_limiter.endpoint_limits = []
+    token = create_access_token({'sub': 42})
+    auth = [(b'authorization', f'Bearer {token}'.encode())]
+
+    rows = []
+    for path, headers in (('/health', []), ('/auth/me', auth)):
+        before = await run(build_app(pure_asgi=False), path, headers)
+        after = await run(build_app(pure_asgi=True), path, headers)
+        rows.append([path, f'{before:,.0f}', f'{after:,.0f}', f'{after / before:.2f}x'])
+    print_table(['endpoint', 'BaseHTTPMiddleware req/s', 'pure ASGI req/s', 'speedup'], rows)
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
@@ -0,0 +1,73 @@
+"""Access token verification throughput.
+
+Compares the old per-request python-jose decode with TokenVerifier on a
+pre-parsed key, without the memo (every call verifies the signature) and
+with it (repeat calls for the same token). RS256 and EdDSA rows need the
+`cryptography` package and are skipped without it.
+"""
+import time
+
+from benchmarks.common import measure, print_table
+from jose import jwt as jose_jwt
+from app.auth.verifier import TokenVerifier
+
+SECRET = 'bench-secret-' + 'x' * 32
+CLAIMS = {
+    'sub': '42', 'fam': 'f' * 32, 'jti': 'j' * 32, 'role': 'employer', 'is_admin': False,
+    'is_active': True, 'email_verified': True, 'company_id': 7,
+}
+
+
+def asymmetric_keys():
+    try:
+        from cryptography.hazmat.primitives import serialization
+        from cryptography.hazmat.primitives.asymmetric import ed25519, rsa
+    except ImportError:
+        return {}
+
+    def pem_pair(private):
+        private_pem = private.private_bytes(
+            serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8, serialization.NoEncryption()
+        ).decode()
+        public_pem = private.public_key().public_bytes(
+            serialization.Encoding.PEM, serialization.PublicFormat.SubjectPublicKeyInfo
+        ).decode()
+        return private_pem, public_pem
+
+    return {
+        'RS256': pem_pair(rsa.generate_private_key(public_exponent=65537, key_size=2048)),
+        'EdDSA': pem_pair(ed25519.Ed25519PrivateKey.generate()),
+    }
+
+
+def ops_per_second(func, number: int) -> str:
+    return f'{1 / measure(func, number=number):,.0f}'
+
+
+def main():
+    claims = {**CLAIMS, 'exp': int(time.time()) + 3600}
+    rows = []
+
+    hs_token = jose_jwt.encode(claims, SECRET, algorithm='HS256')
+    rows.append(['HS256', 'jose.decode per request (before)',
+                 ops_per_second(lambda: jose_jwt.decode(hs_token, SECRET, algorithms=['HS256']), 2000)])
+
+    verifiers = [('HS256', TokenVerifier('HS256', secret=SECRET, memo_size=0))]
+    for algorithm, (private_pem, public_pem) in asymmetric_keys().items():
+        verifiers.append((algorithm, TokenVerifier(algorithm, private_key=private_pem,
+                                                   public_key=public_pem, memo_size=0)))
+
+    for algorithm, verifier in verifiers:
+        token = verifier.encode(claims)
+        rows.append([algorithm, f'TokenVerifier ({verifier.backend}), no memo',
+                     ops_per_second(lambda: verifier.decode(token), 2000)])
+        verifier.memo_size = 4096
+        verifier.decode(token)
+        rows.append([algorithm, f'TokenVerifier ({verifier.backend}), memo hit',
+                     ops_per_second(lambda: verifier.decode(token), 20000)])
+
+    print_table(['algorithm', 'path', 'verifies/s'], rows)
+
+
+if __name__ == '__main__':
+    main()
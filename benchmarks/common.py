@@ -0,0 +1,42 @@
+"""Helpers shared by the micro-benchmarks.
+
+Run a benchmark from the repository root, e.g.
+`python -m benchmarks.bench_cache_codec`. Numbers are best-of-N wall
+times of this process; compare them on the same machine only.
+"""
+import os
+import time
+import timeit
+from typing import Awaitable, Callable, List, Sequence
+
+# app.config.setting validates these at import; DB benchmarks connect to BENCH_DATABASE_URL instead
+for _name, _value in {
+    'POSTGRES_USER': 'bench', 'POSTGRES_PASSWORD': 'bench', 'POSTGRES_HOST': 'localhost',
+    'POSTGRES_DB': 'bench', 'JWT_SECRET_KEY': 'bench-secret',
+}.items():
+    os.environ.setdefault(_name, _value)
+
+
+def measure(func: Callable[[], object], number: int = 1000, repeat: int = 5) -> float:
+    """Best time per call in seconds over `repeat` rounds of `number` calls"""
+    return min(timeit.Timer(func).repeat(repeat=repeat, number=number)) / number
+
+
+async def measure_async(func: Callable[[], Awaitable[object]], number: int = 20, repeat: int = 3) -> float:
+    """measure() for coroutine functions, awaited back to back on the running loop"""
+    rounds = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            await func()
+        rounds.append(time.perf_counter() - start)
+    return min(rounds) / number
+
+
+def print_table(headers: Sequence[str], rows: List[Sequence[object]]):
+    cells = [[str(cell) for cell in row] for row in [headers, *rows]]
+    widths = [max(len(row[index]) for row in cells) for index in range(len(headers))]
+    for position, row in enumerate(cells):
+        print('  '.join(cell.ljust(width) for cell, width in zip(row, widths)).rstrip())
+        if position == 0:
+            print('  '.join('-' * width for width in widths))
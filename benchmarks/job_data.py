@@ -0,0 +1,139 @@
+"""Synthetic job board in a throwaway PostgreSQL schema for the DB benchmarks.
+
+Tables are created in the schema `bench` of the database at
+BENCH_DATABASE_URL (default: the app's DATABASE_URL), so an existing app
+schema is left alone. Seeding is skipped when the schema already holds the
+requested number of jobs, so a large table is paid for once; drop the
+schema to start over.
+"""
+import os
+import time
+
+from sqlalchemy import func, insert, literal_column, select, text
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine
+
+from benchmarks import common  # noqa: F401  (env defaults before app.config.setting)
+from app.config.setting import settings
+from app.db.database import Base
+from app.models.company_model import Company
+from app.models.jobs_model import Categories, Job, Skill, Tag, job_skills, job_tags
+from app.models.users_model import User
+from app.services.jobs_service import JobService
+from app.utils.enums import EmploymentType, UserRole
+
+SCHEMA = 'bench'
+# Shared by every DB benchmark so they reuse one seeded table
+DEFAULT_JOBS = 1_000_000
+
+SENIORITY = ['Junior', 'Middle', 'Senior', 'Lead', 'Principal', 'Staff', 'Intern', 'Head of']
+TECHNOLOGIES = [
+    'Python', 'Java', 'Go', 'Rust', 'Kotlin', 'Swift', 'TypeScript', 'React', 'Angular', 'Vue',
+    'PHP', 'Ruby', 'Scala', 'Elixir', 'Django', 'FastAPI', 'Spring', 'Node', 'Flutter', 'Unity',
+]
+ROLES = ['Developer', 'Engineer', 'Architect', 'Consultant', 'Specialist', 'Programmer']
+TAGS = ['remote', 'hybrid', 'relocation', 'startup', 'enterprise', 'fintech', 'healthtech', 'gaming',
+        'ecommerce', 'visa-sponsorship', 'four-day-week', 'equity', 'bonus', 'night-shift', 'part-time']
+SKILLS = TECHNOLOGIES + ['PostgreSQL', 'Redis', 'Docker', 'Kubernetes', 'AWS', 'GCP', 'Kafka', 'GraphQL',
+                         'Terraform', 'Linux', 'Git', 'CI/CD', 'Microservices', 'REST', 'gRPC']
+CATEGORIES = 10
+COMPANIES = 20
+# Only what search and hydration touch; create_all on the whole metadata is not needed
+TABLES = [User.__table__, Company.__table__, Categories.__table__, Skill.__table__, Tag.__table__,
+          Job.__table__, job_skills, job_tags]
+SKILLS_PER_JOB = 3
+TAGS_PER_JOB = 2
+
+
+def database_url() -> str:
+    return os.environ.get('BENCH_DATABASE_URL', settings.DATABASE_URL)
+
+
+def job_count() -> int:
+    return int(os.environ.get('BENCH_JOBS', DEFAULT_JOBS))
+
+
+def create_engine() -> AsyncEngine:
+    return create_async_engine(database_url(), connect_args={'server_settings': {'search_path': SCHEMA}})
+
+
+def session_factory(engine: AsyncEngine) -> async_sessionmaker:
+    return async_sessionmaker(engine, expire_on_commit=False)
+
+
+def _pick(words, position: str) -> str:
+    """SQL picking one of `words` by the integer expression `position`"""
+    quoted = ', '.join("'" + word.replace("'", "''") + "'" for word in words)
+    return f'(ARRAY[{quoted}])[1 + ({position}) % {len(words)}]'
+
+
+def _job_rows(count: int):
+    series = func.generate_series(1, count).alias('g')
+    title = f"{_pick(SENIORITY, 'g')} || ' ' || {_pick(TECHNOLOGIES, 'g / 7')} || ' ' || {_pick(ROLES, 'g / 3')}"
+    description = (
+        f"'Join a ' || {_pick(TAGS, 'g / 5')} || ' team building ' || {_pick(TECHNOLOGIES, 'g / 11')}"
+        f" || ' services. You will design, ship and operate features used by thousands of customers.'"
+    )
+    columns = {
+        'title': title,
+        'description': description,
+        'salary': '1000 + (g * 37) % 9000',
+        'location': _pick(['Baku', 'Berlin', 'London', 'Warsaw', 'Remote'], 'g'),
+        'employment_type': f"{_pick([member.name for member in EmploymentType], 'g')}::employmenttype",
+        'skill_levels': f"ARRAY[{_pick(['junior', 'middle', 'senior'], 'g')}]::varchar(20)[]",
+        'expires_at': "now() + (2 + g % 90) * interval '1 day'",
+        'category_id': f'1 + g % {CATEGORIES}',
+        'company_id': f'1 + g % {COMPANIES}',
+        'slug': "'job-' || g",
+        'created_at': "now() - (g % 365) * interval '1 day'",
+    }
+    return list(columns), select(*(literal_column(expression) for expression in columns.values())).select_from(series)
+
+
+async def _link(connection, table, column: str, entities: int, per_job: int):
+    await connection.execute(text(
+        f'INSERT INTO {table.name} (job_id, {column}) '
+        f'SELECT DISTINCT job.id, 1 + (job.id * (7 * k + 3)) % {entities} '
+        f'FROM job CROSS JOIN generate_series(1, {per_job}) AS k'
+    ))
+
+
+async def seed(engine: AsyncEngine, count: int) -> None:
+    """Create the schema and fill it with `count` active jobs unless it already has them"""
+    async with engine.begin() as connection:
+        await connection.execute(text(f'CREATE SCHEMA IF NOT EXISTS {SCHEMA}'))
+        await connection.run_sync(Base.metadata.create_all, tables=TABLES)
+        if await connection.scalar(select(func.count()).select_from(Job)) == count:
+            return
+
+    print(f'Seeding {count} jobs into schema {SCHEMA!r} ...')
+    start = time.perf_counter()
+    async with engine.begin() as connection:
+        await connection.execute(text(
+            'TRUNCATE job_skills, job_tags, job, skill, tag, categories, company, "user" RESTART IDENTITY CASCADE'
+        ))
+        await connection.execute(insert(User), [{
+            'name': f'Owner {index}', 'email': f'owner{index}@bench.local',
+            'role': UserRole.EMPLOYER, 'hashed_password': 'x',
+        } for index in range(1, COMPANIES + 1)])
+        await connection.execute(insert(Company), [{
+            'name': f'Company {index}', 'description': 'Benchmark company', 'owner_id': index,
+        } for index in range(1, COMPANIES + 1)])
+        await connection.execute(insert(Categories), [{
+            'name': f'Category {index}', 'description': 'Benchmark category',
+        } for index in range(1, CATEGORIES + 1)])
+        await connection.execute(insert(Skill), [{'name': name, 'normalized_name': name.lower()} for name in SKILLS])
+        await connection.execute(insert(Tag), [{'name': name, 'normalized_name': name} for name in TAGS])
+
+        names, rows = _job_rows(count)
+        await connection.execute(insert(Job).from_select(names, rows))
+        await _link(connection, job_skills, 'skill_id', len(SKILLS), SKILLS_PER_JOB)
+        await _link(connection, job_tags, 'tag_id', len(TAGS), TAGS_PER_JOB)
+        # Same weighted document JobService maintains per job, for all rows at once
+        await connection.execute(
+            Job.__table__.update().values(search_vector=JobService.search_document())
+        )
+
+    async with engine.connect() as connection:
+        autocommit = await connection.execution_options(isolation_level='AUTOCOMMIT')
+        await autocommit.execute(text('VACUUM ANALYZE job, job_skills, job_tags, skill, tag'))
+    print(f'Seeded in {time.perf_counter() - start:.1f}s')
@@ -0,0 +1,35 @@
+import os
+from contextlib import contextmanager
+
+import pytest
+
+# Settings are read at import time; the unit tests never reach these services
+for _name, _value in {
+    'POSTGRES_USER': 'test', 'POSTGRES_PASSWORD': 'test', 'POSTGRES_HOST': 'localhost',
+    'POSTGRES_DB': 'test', 'JWT_SECRET_KEY': 'test-secret',
+}.items():
+    os.environ.setdefault(_name, _value)
+
+from app.db.query_stats import current_query_stats, start_query_stats, stop_query_stats
+
+
+@pytest.fixture
+def assert_max_queries():
+    """Fail when the block runs more SQL statements than allowed.
+
+        with assert_max_queries(2):
+            await service.get_job(job_id)
+
+    Counts statements of instrumented engines only (see instrument_engine).
+    """
+    @contextmanager
+    def _assert_max_queries(limit: int):
+        token = start_query_stats()
+        stats = current_query_stats()
+        try:
+            yield stats
+        finally:
+            stop_query_stats(token)
+        assert stats.count <= limit, f'Expected at most {limit} queries, {stats.count} were executed'
+
+    return _assert_max_queries
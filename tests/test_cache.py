@@ -0,0 +1,68 @@
+import asyncio
+
+import pytest
+
+fakeredis = pytest.importorskip('fakeredis')
+
+from app.config.cache import CacheManager
+
+
+@pytest.fixture
+def cache():
+    return CacheManager(fakeredis.FakeAsyncRedis())
+
+
+@pytest.mark.asyncio
+async def test_get_or_compute_stores_result(cache):
+    calls = []
+
+    async def compute():
+        calls.append(1)
+        return {'id': 1}
+
+    assert await cache.get_or_compute('job:1', compute) == {'id': 1}
+    assert await cache.get_or_compute('job:1', compute) == {'id': 1}
+    assert len(calls) == 1
+
+
+@pytest.mark.asyncio
+async def test_delete_during_compute_skips_store(cache):
+    async def compute():
+        # The row is updated and its cache entry deleted while this read is in flight
+        await cache.delete('job:1')
+        return {'title': 'before update'}
+
+    assert await cache.get_or_compute('job:1', compute) == {'title': 'before update'}
+    assert await cache.get('job:1') is None
+
+
+@pytest.mark.asyncio
+async def test_namespace_invalidation_during_compute_skips_store(cache):
+    async def compute():
+        await cache.invalidate('job_search')
+        return [1, 2]
+
+    await cache.get_or_compute('page:1', compute, namespace='job_search')
+    assert await cache.get('page:1', namespace='job_search') is None
+
+
+@pytest.mark.asyncio
+async def test_cancelled_leader_does_not_fail_followers(cache):
+    started, release = asyncio.Event(), asyncio.Event()
+
+    async def compute():
+        started.set()
+        await release.wait()
+        return 'value'
+
+    leader = asyncio.create_task(cache.get_or_compute('job:1', compute))
+    await started.wait()
+    follower = asyncio.create_task(cache.get_or_compute('job:1', compute))
+    await asyncio.sleep(0.05)
+
+    leader.cancel()
+    release.set()
+
+    assert await follower == 'value'
+    with pytest.raises(asyncio.CancelledError):
+        await leader
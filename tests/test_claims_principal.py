@@ -0,0 +1,71 @@
+import pytest
+
+from app.auth import deps
+from app.auth.jwt import create_access_token
+from app.auth.revocation import token_revocations
+from app.config.setting import settings
+from app.schemas.user_schema import UserPrincipal
+
+STORED = UserPrincipal(id=7, role='candidate', is_admin=False, company_id=None)
+
+
+class FakeRedis:
+    def __init__(self, reachable: bool = True):
+        self.reachable = reachable
+
+    async def mget(self, *keys):
+        if not self.reachable:
+            raise ConnectionError('redis down')
+        return [None] * len(keys)
+
+
+@pytest.fixture
+def token():
+    # Claims say admin employer; the stored principal says candidate
+    return create_access_token({'sub': 7, 'role': 'employer', 'is_admin': True, 'company_id': 3})
+
+
+@pytest.fixture
+def lookups(monkeypatch):
+    lookups = []
+
+    async def cached_principal(user_id):
+        lookups.append(user_id)
+        return STORED
+
+    monkeypatch.setattr(settings, 'AUTH_CLAIMS_PRINCIPAL', True)
+    monkeypatch.setattr(deps.principal_cache, 'get', cached_principal)
+    yield lookups
+    token_revocations.attach(None)
+
+
+@pytest.mark.asyncio
+async def test_claims_trusted_when_revocation_store_is_reachable(token, lookups):
+    token_revocations.attach(FakeRedis())
+
+    principal = await deps.get_claims_principal(token, db=None)
+
+    assert (principal.role, principal.is_admin, principal.company_id) == ('employer', True, 3)
+    assert lookups == []
+
+
+@pytest.mark.asyncio
+async def test_claims_ignored_when_revocation_store_fails(token, lookups):
+    token_revocations.attach(FakeRedis(reachable=False))
+
+    assert await deps.get_claims_principal(token, db=None) == STORED
+    assert lookups == [7]
+
+
+@pytest.mark.asyncio
+async def test_claims_ignored_without_revocation_store(token, lookups):
+    assert await deps.get_claims_principal(token, db=None) == STORED
+    assert lookups == [7]
+
+
+@pytest.mark.asyncio
+async def test_current_principal_never_trusts_claims(token, lookups):
+    token_revocations.attach(FakeRedis())
+
+    assert await deps.get_current_principal(token, db=None) == STORED
+    assert lookups == [7]
@@ -0,0 +1,58 @@
+import base64
+import json
+from datetime import datetime
+
+import pytest
+
+from app.utils.cursor import encode_cursor, decode_cursor
+
+
+def _raw_cursor(payload: dict) -> str:
+    return base64.urlsafe_b64encode(json.dumps(payload).encode()).decode().rstrip('=')
+
+
+@pytest.mark.parametrize('sort_by, value', [
+    ('created_at', datetime(2024, 5, 1, 12, 30)),
+    ('salary', 1500.5),
+    ('salary', 1500),
+    ('title', 'Backend developer'),
+    ('relevance', 0.25),
+])
+def test_round_trip(sort_by, value):
+    cursor = encode_cursor(sort_by, 'desc', value, 42)
+    assert decode_cursor(cursor, sort_by, 'desc') == (value, 42)
+
+
+def test_rejects_other_sorting():
+    cursor = encode_cursor('salary', 'asc', 100.0, 1)
+    with pytest.raises(ValueError):
+        decode_cursor(cursor, 'salary', 'desc')
+    with pytest.raises(ValueError):
+        decode_cursor(cursor, 'title', 'asc')
+
+
+@pytest.mark.parametrize('sort_by, value', [
+    ('salary', '1000'),
+    ('salary', {'$gt': 0}),
+    ('salary', True),
+    ('salary', None),
+    ('title', 10),
+    ('title', ['a']),
+    ('created_at', '2024-05-01'),
+])
+def test_rejects_mistyped_value(sort_by, value):
+    cursor = _raw_cursor({'s': sort_by, 'o': 'desc', 'id': 1, 'v': value})
+    with pytest.raises(ValueError):
+        decode_cursor(cursor, sort_by, 'desc')
+
+
+def test_rejects_non_finite_number():
+    cursor = base64.urlsafe_b64encode(b'{"s":"salary","o":"desc","id":1,"v":NaN}').decode()
+    with pytest.raises(ValueError):
+        decode_cursor(cursor, 'salary', 'desc')
+
+
+@pytest.mark.parametrize('cursor', ['not-base64!', _raw_cursor({'s': 'salary'}), _raw_cursor([1, 2])])
+def test_rejects_malformed(cursor):
+    with pytest.raises(ValueError):
+        decode_cursor(cursor, 'salary', 'desc')
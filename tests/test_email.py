@@ -0,0 +1,122 @@
+import asyncio
+import smtplib
+import socket
+import ssl
+from email.mime.text import MIMEText
+from pathlib import Path
+
+import pytest
+
+aiosmtpd_controller = pytest.importorskip('aiosmtpd.controller')
+from aiosmtpd.smtp import AuthResult, LoginPassword
+
+from app.config.setting import settings
+from app.utils.email import EmailService, SMTPConnectionPool
+
+CERTS = Path(__file__).parent / 'certs'
+USERNAME, PASSWORD = 'mailer@example.com', 'secret'
+
+
+class RecordingHandler:
+    def __init__(self):
+        self.messages = []
+
+    async def handle_DATA(self, server, session, envelope):
+        self.messages.append(envelope)
+        return '250 OK'
+
+
+class CountingAuthenticator:
+    def __init__(self):
+        self.logins = 0
+
+    def __call__(self, server, session, envelope, mechanism, auth_data):
+        ok = isinstance(auth_data, LoginPassword) and \
+            (auth_data.login.decode(), auth_data.password.decode()) == (USERNAME, PASSWORD)
+        self.logins += ok
+        # handled=False lets aiosmtpd answer 535 itself
+        return AuthResult(success=ok, handled=False)
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+@pytest.fixture
+def smtp_server():
+    tls_context = ssl.create_default_context(ssl.Purpose.CLIENT_AUTH)
+    tls_context.load_cert_chain(CERTS / 'smtp.crt', CERTS / 'smtp.key')
+    handler, authenticator = RecordingHandler(), CountingAuthenticator()
+    controller = aiosmtpd_controller.Controller(
+        handler,
+        hostname='127.0.0.1',
+        port=_free_port(),
+        tls_context=tls_context,
+        require_starttls=True,
+        authenticator=authenticator,
+    )
+    controller.start()
+    yield controller, handler, authenticator
+    controller.stop()
+
+
+def _message(to: str) -> MIMEText:
+    message = MIMEText('body')
+    message['From'], message['To'], message['Subject'] = USERNAME, to, 'Test'
+    return message
+
+
+def test_pool_reuses_authenticated_session(smtp_server):
+    controller, handler, authenticator = smtp_server
+    pool = SMTPConnectionPool(controller.hostname, controller.port, USERNAME, PASSWORD, size=2)
+
+    for index in range(3):
+        pool.send(_message(f'user{index}@example.com'))
+    pool.close()
+
+    assert [envelope.rcpt_tos for envelope in handler.messages] == [
+        ['user0@example.com'], ['user1@example.com'], ['user2@example.com']
+    ]
+    assert authenticator.logins == 1
+
+
+def test_pool_replaces_idle_sessions(smtp_server):
+    controller, handler, authenticator = smtp_server
+    pool = SMTPConnectionPool(controller.hostname, controller.port, USERNAME, PASSWORD, idle_timeout=0)
+
+    pool.send(_message('a@example.com'))
+    pool.send(_message('b@example.com'))
+    pool.close()
+
+    assert len(handler.messages) == 2
+    assert authenticator.logins == 2
+
+
+def test_pool_rejects_bad_credentials(smtp_server):
+    controller, handler, _ = smtp_server
+    pool = SMTPConnectionPool(controller.hostname, controller.port, USERNAME, 'wrong')
+
+    with pytest.raises(smtplib.SMTPAuthenticationError):
+        pool.send(_message('a@example.com'))
+    assert handler.messages == []
+
+
+@pytest.mark.asyncio
+async def test_email_service_sends_concurrently_over_the_pool(smtp_server):
+    controller, handler, authenticator = smtp_server
+    service = EmailService()
+    service.smtp_server, service.smtp_port = controller.hostname, controller.port
+    service.username, service.password = USERNAME, PASSWORD
+
+    results = await asyncio.gather(*(
+        service.send_email(f'user{index}@example.com', 'Hello', '<p>Hi</p>', is_html=True)
+        for index in range(8)
+    ))
+    await service.close()
+
+    assert all(results)
+    assert len(handler.messages) == 8
+    # Never more sessions than sender threads
+    assert 1 <= authenticator.logins <= settings.SMTP_POOL_SIZE
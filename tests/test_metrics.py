@@ -0,0 +1,29 @@
+from app.config.metrics import Counter, Gauge, Histogram, MetricsRegistry
+
+
+def test_render_uses_sample_names_for_metadata():
+    registry = MetricsRegistry()
+    requests = Counter('http_requests', 'HTTP requests', ['status'], registry=registry)
+    Gauge('in_flight', 'Requests in flight', registry=registry).set(3)
+    latency = Histogram('latency_seconds', 'Latency', buckets=(0.1, 1.0), registry=registry)
+    requests.inc('200')
+    requests.inc('200')
+    latency.observe(0.5)
+
+    lines = registry.render().splitlines()
+
+    assert '# HELP http_requests_total HTTP requests' in lines
+    assert '# TYPE http_requests_total counter' in lines
+    assert 'http_requests_total{status="200"} 2.0' in lines
+    assert '# TYPE in_flight gauge' in lines
+    assert 'in_flight 3.0' in lines
+    assert '# TYPE latency_seconds histogram' in lines
+    assert 'latency_seconds_bucket{le="0.1"} 0.0' in lines
+    assert 'latency_seconds_bucket{le="+Inf"} 1.0' in lines
+    assert 'latency_seconds_count 1.0' in lines
+
+
+def test_label_values_are_escaped():
+    registry = MetricsRegistry()
+    Counter('errors', 'Errors', ['message'], registry=registry).inc('say "hi"\n')
+    assert 'errors_total{message="say \\"hi\\"\\n"} 1.0' in registry.render()
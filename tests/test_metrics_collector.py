@@ -0,0 +1,57 @@
+import pytest
+from sqlalchemy.exc import IntegrityError
+
+from app.services import metrics_service
+from app.services.metrics_service import MetricsCollector
+
+EXISTING_USERS = {1}
+
+
+class FakeSession:
+    def __init__(self, written: list):
+        self.written = written
+        self.pending = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+    async def execute(self, statement, rows):
+        if any(row['user_id'] not in EXISTING_USERS | {None} for row in rows):
+            raise IntegrityError('INSERT INTO performance_metric', rows, Exception('user_id fkey'))
+        self.pending = rows
+
+    async def commit(self):
+        self.written.extend(self.pending)
+
+
+@pytest.fixture
+def written(monkeypatch):
+    written = []
+    monkeypatch.setattr(metrics_service, 'async_session', lambda: FakeSession(written))
+    return written
+
+
+@pytest.mark.asyncio
+async def test_flush_writes_in_batches(written):
+    collector = MetricsCollector(batch_size=2)
+    for _ in range(5):
+        collector.record('/jobs', 'GET', 200, 0.01, user_id=1)
+
+    assert await collector.flush() == 5
+    assert [row['user_id'] for row in written] == [1] * 5
+    assert collector.get_stats() == {'buffered': 0, 'recorded': 5, 'dropped': 0}
+
+
+@pytest.mark.asyncio
+async def test_deleted_user_does_not_drop_the_batch(written):
+    collector = MetricsCollector(batch_size=10)
+    collector.record('/jobs', 'GET', 200, 0.01, user_id=1)
+    collector.record('/jobs', 'GET', 200, 0.02, user_id=404)
+
+    assert await collector.flush() == 2
+    assert [row['user_id'] for row in written] == [None, None]
+    assert [row['response_time'] for row in written] == [0.01, 0.02]
+    assert collector.dropped == 0
@@ -0,0 +1,78 @@
+import pytest
+from sqlalchemy import create_engine, text
+
+from app.db.query_stats import current_query_stats, instrument_engine, normalize_sql
+
+
+@pytest.fixture
+def engine():
+    engine = create_engine('sqlite://')
+    instrument_engine(engine)
+    with engine.begin() as conn:
+        conn.execute(text('CREATE TABLE job (id INTEGER PRIMARY KEY, title TEXT)'))
+    yield engine
+    engine.dispose()
+
+
+def test_counts_statements_and_time(engine, assert_max_queries):
+    with assert_max_queries(2) as stats:
+        with engine.begin() as conn:
+            conn.execute(text("INSERT INTO job (title) VALUES ('a'), ('b')"))
+            conn.execute(text('SELECT * FROM job')).all()
+
+    assert stats.count == 2
+    assert stats.duration > 0
+    assert current_query_stats() is None
+
+
+def test_fails_above_budget(engine, assert_max_queries):
+    with pytest.raises(AssertionError, match='at most 1 queries, 3'):
+        with assert_max_queries(1):
+            with engine.connect() as conn:
+                for job_id in range(3):
+                    conn.execute(text('SELECT * FROM job WHERE id = :id'), {'id': job_id})
+
+
+def test_statements_outside_a_block_are_not_counted(engine, assert_max_queries):
+    with engine.connect() as conn:
+        conn.execute(text('SELECT 1'))
+        with assert_max_queries(0) as stats:
+            pass
+    assert stats.count == 0
+
+
+@pytest.fixture
+def slow_engine():
+    # Any statement is slower than a nanosecond
+    engine = create_engine('sqlite://')
+    instrument_engine(engine, slow_query_ms=1e-6)
+    yield engine
+    engine.dispose()
+
+
+def test_logs_slow_queries(slow_engine, caplog):
+    with caplog.at_level('WARNING', logger='app.db.query_stats'):
+        with slow_engine.connect() as conn:
+            conn.execute(text('SELECT :id AS id'), {'id': 7})
+
+    [record] = caplog.records
+    assert record.sql == 'SELECT ? AS id'
+    assert record.param_count == 1
+    assert record.caller == 'unknown'
+
+
+def test_slow_query_settings_are_per_engine(slow_engine, engine, caplog):
+    with caplog.at_level('WARNING', logger='app.db.query_stats'):
+        # engine was instrumented without a threshold after slow_engine
+        with engine.connect() as conn:
+            conn.execute(text('SELECT * FROM job'))
+        assert caplog.records == []
+
+        with slow_engine.connect() as conn:
+            conn.execute(text('SELECT 1'))
+    assert len(caplog.records) == 1
+
+
+def test_normalize_sql():
+    assert normalize_sql("SELECT *\n  FROM job WHERE id IN ($1, $2, $3) AND title = 'x'") == \
+        'SELECT * FROM job WHERE id IN (?, ...) AND title = ?'
@@ -0,0 +1,132 @@
+import tracemalloc
+
+import pytest
+
+from app.config import rate_limit
+from app.config.rate_limit import LocalTokenBucket, RateLimiter
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self) -> float:
+        return self.now
+
+    def advance(self, seconds: float):
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(rate_limit, 'time', clock)
+    return clock
+
+
+def test_burst_up_to_limit_then_reject(clock):
+    buckets = LocalTokenBucket()
+    assert [buckets.hit('ip', 5, 60)[0] for _ in range(5)] == [True] * 5
+
+    allowed, retry_after = buckets.hit('ip', 5, 60)
+    assert not allowed
+    assert retry_after == pytest.approx(12.0)
+
+
+def test_refills_with_elapsed_time(clock):
+    buckets = LocalTokenBucket()
+    for _ in range(5):
+        buckets.hit('ip', 5, 60)
+
+    clock.advance(11.9)
+    assert not buckets.hit('ip', 5, 60)[0]
+    clock.advance(0.2)
+    assert buckets.hit('ip', 5, 60)[0]
+    assert not buckets.hit('ip', 5, 60)[0]
+
+
+def test_refill_is_capped_at_limit(clock):
+    buckets = LocalTokenBucket()
+    buckets.hit('ip', 3, 60)
+    clock.advance(3600)
+    assert [buckets.hit('ip', 3, 60)[0] for _ in range(4)] == [True, True, True, False]
+
+
+def test_identities_are_independent(clock):
+    buckets = LocalTokenBucket()
+    assert buckets.hit('a', 1, 60)[0]
+    assert not buckets.hit('a', 1, 60)[0]
+    assert buckets.hit('b', 1, 60)[0]
+
+
+def test_evicts_least_recently_seen_over_max_keys(clock):
+    buckets = LocalTokenBucket(max_keys=2)
+    buckets.hit('a', 1, 60)
+    buckets.hit('b', 1, 60)
+    buckets.hit('a', 1, 60)
+    buckets.hit('c', 1, 60)
+
+    assert len(buckets) == 2
+    # 'a' was seen again and is still empty; 'b' was evicted and starts full
+    assert not buckets.hit('a', 1, 60)[0]
+    assert buckets.hit('b', 1, 60)[0]
+
+
+def test_sweep_drops_only_idle_buckets(clock):
+    buckets = LocalTokenBucket()
+    buckets.hit('old', 5, 60)
+    clock.advance(30)
+    buckets.hit('recent', 5, 60)
+    clock.advance(40)
+
+    assert buckets.sweep(60) == 1
+    assert len(buckets) == 1
+    assert buckets.sweep(60) == 0
+
+
+def test_resolve_limit_prefers_longest_prefix():
+    limiter = RateLimiter(60, {'/auth': 30, '/auth/login': 10})
+    assert limiter.resolve_limit('/auth/login') == ('/auth/login', 10)
+    assert limiter.resolve_limit('/auth/refresh') == ('/auth', 30)
+    assert limiter.resolve_limit('/jobs') == ('global', 60)
+
+
+@pytest.mark.asyncio
+async def test_falls_back_to_local_buckets_when_redis_fails(clock):
+    calls = []
+
+    async def failing_script(keys, args):
+        calls.append(keys)
+        raise ConnectionError('redis down')
+
+    limiter = RateLimiter(2)
+    limiter._gcra = failing_script
+
+    results = [(await limiter.hit('ip', '/jobs'))[0] for _ in range(3)]
+
+    assert results == [True, True, False]
+    # Redis is skipped for a while after the first error
+    assert len(calls) == 1
+    clock.advance(rate_limit.REDIS_RETRY_AFTER)
+    await limiter.hit('ip', '/jobs')
+    assert len(calls) == 2
+
+
+@pytest.mark.slow
+@pytest.mark.asyncio
+async def test_memory_stays_flat_with_a_million_client_ips():
+    limiter = RateLimiter(60, local_max_keys=10000)
+    for index in range(limiter.local.max_keys):
+        await limiter.hit(f'warmup-{index}', '/jobs')
+
+    tracemalloc.start()
+    try:
+        for index in range(1_000_000):
+            await limiter.hit(f'10.{index >> 16 & 255}.{index >> 8 & 255}.{index & 255}', '/jobs')
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    assert len(limiter.local) == limiter.local.max_keys
+    # A full map of 10k buckets is ~2 MB; keeping all 1M would take ~200 MB
+    assert peak < 5 * 1024 * 1024
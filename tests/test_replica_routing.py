@@ -0,0 +1,90 @@
+import asyncio
+
+import pytest
+
+from app.db import routing
+from app.db.routing import ReplicaRouter
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self) -> float:
+        return self.now
+
+
+class FakeRedis:
+    def __init__(self, fail: bool = False):
+        self.keys = {}
+        self.fail = fail
+
+    async def set(self, key, value, px=None):
+        self.keys[key] = value
+
+    async def exists(self, key):
+        if self.fail:
+            raise ConnectionError('redis down')
+        return int(key in self.keys)
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(routing, 'time', clock)
+    return clock
+
+
+@pytest.mark.asyncio
+async def test_reads_go_to_primary_within_sticky_window(clock):
+    router = ReplicaRouter(sticky_seconds=5)
+    assert not await router.use_primary(7)
+
+    router.mark_write(7)
+    assert await router.use_primary(7)
+    assert not await router.use_primary(8)
+
+    clock.now += 5.1
+    assert not await router.use_primary(7)
+
+
+@pytest.mark.asyncio
+async def test_anonymous_or_disabled_never_pins(clock):
+    router = ReplicaRouter(sticky_seconds=5)
+    router.mark_write(None)
+    assert not await router.use_primary(None)
+
+    disabled = ReplicaRouter(sticky_seconds=0)
+    disabled.mark_write(7)
+    assert not await disabled.use_primary(7)
+
+
+@pytest.mark.asyncio
+async def test_local_writers_are_capped(clock):
+    router = ReplicaRouter(sticky_seconds=5, max_local=2)
+    for user_id in (1, 2, 3):
+        router.mark_write(user_id)
+
+    assert not await router.use_primary(1)
+    assert await router.use_primary(2) and await router.use_primary(3)
+
+
+@pytest.mark.asyncio
+async def test_marker_is_shared_through_redis(clock):
+    redis = FakeRedis()
+    writer, other_worker = ReplicaRouter(sticky_seconds=5), ReplicaRouter(sticky_seconds=5)
+    writer.attach(redis)
+    other_worker.attach(redis)
+
+    writer.mark_write(7)
+    await asyncio.sleep(0)
+
+    assert await other_worker.use_primary(7)
+    assert not await other_worker.use_primary(8)
+
+
+@pytest.mark.asyncio
+async def test_redis_failure_reads_from_primary(clock):
+    router = ReplicaRouter(sticky_seconds=5)
+    router.attach(FakeRedis(fail=True))
+    assert await router.use_primary(7)
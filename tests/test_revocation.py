@@ -0,0 +1,75 @@
+import pytest
+
+from app.auth import revocation
+from app.auth.revocation import TokenRevocationList
+
+
+class FakeRedis:
+    def __init__(self):
+        self.values = {}
+
+    async def set(self, key, value, ex=None):
+        self.values[key] = str(value).encode()
+
+    async def mget(self, *keys):
+        return [self.values.get(key) for key in keys]
+
+
+class FakeTime:
+    def __init__(self, now: float):
+        self.now = now
+
+    def time(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeTime(1_700_000_000.250)
+    monkeypatch.setattr(revocation, 'time', clock)
+    return clock
+
+
+@pytest.fixture
+def revocations():
+    revocations = TokenRevocationList(max_token_lifetime=900)
+    revocations.attach(FakeRedis())
+    return revocations
+
+
+def _claims(issued_at: float, **extra) -> dict:
+    return {'sub': '7', 'jti': 'j', 'iat': int(issued_at), 'iat_ms': int(issued_at * 1000), **extra}
+
+
+@pytest.mark.asyncio
+async def test_token_issued_in_same_second_after_revocation_is_valid(clock, revocations):
+    await revocations.revoke_user(7)
+
+    assert await revocations.is_revoked(_claims(clock.now - 0.2))
+    assert not await revocations.is_revoked(_claims(clock.now + 0.3))
+    assert int(clock.now + 0.3) == int(clock.now)
+
+
+@pytest.mark.asyncio
+async def test_token_issued_in_same_millisecond_is_valid(clock, revocations):
+    await revocations.revoke_user(7)
+    assert not await revocations.is_revoked(_claims(clock.now))
+
+
+@pytest.mark.asyncio
+async def test_kept_family_survives_revoke(clock, revocations):
+    await revocations.revoke_user(7, keep_family='mine')
+
+    assert not await revocations.is_revoked(_claims(clock.now - 1, fam='mine'))
+    assert await revocations.is_revoked(_claims(clock.now - 1, fam='other'))
+
+
+@pytest.mark.asyncio
+async def test_tokens_without_iat_ms_and_seconds_markers(clock, revocations):
+    legacy = {'sub': '7', 'jti': 'j', 'iat': int(clock.now)}
+    await revocations.redis.set('revoked_user:7', int(clock.now))
+    assert await revocations.is_revoked(legacy)
+
+    await revocations.revoke_user(7)
+    assert await revocations.is_revoked(legacy)
+    assert not await revocations.is_revoked({**legacy, 'iat': int(clock.now) + 1})